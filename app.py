@@ -1,15 +1,92 @@
 import chainlit as cl
 import os
-from openai import AsyncAzureOpenAI
+import asyncio
+import logging
+import httpx
+from openai import AsyncAzureOpenAI, DefaultAioHttpClient, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
 import traceback
 import json
+import hashlib
+import io
+import re
+from collections import deque
+from functools import lru_cache
+from cachetools import TTLCache
 from mcp import ClientSession
 
+try:
+    import orjson
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS).decode()
+except ImportError:
+    def json_loads(data):
+        return json.loads(data)
+
+    def json_dumps(obj) -> str:
+        return json.dumps(obj, default=str, sort_keys=True, separators=(",", ":"))
+
+logging.basicConfig()
+log = logging.getLogger("chatbot")
+log.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
+try:
+    from jsonschema import Draft202012Validator, SchemaError
+    from jsonschema.exceptions import best_match
+except ImportError:
+    log.warning("jsonschema not installed, tool arguments will not be validated locally")
+    Draft202012Validator = None
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception as e:
+    log.warning("tiktoken encoding unavailable (%s), estimating token counts from length", e)
+    _encoding = None
+
 load_dotenv()
 
+REQUIRED_ENV_VARS = ["AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_API_KEY", "AZURE_OPENAI_DEPLOYMENT_NAME"]
+AZURE_OPENAI_ENDPOINT = os.environ.get("AZURE_OPENAI_ENDPOINT")
+AZURE_OPENAI_DEPLOYMENT_NAME = os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME")
+AZURE_OPENAI_API_VERSION = os.environ.get("AZURE_OPENAI_API_VERSION", "2024-02-01")
+MISSING_ENV_VARS = [var for var in REQUIRED_ENV_VARS if not os.environ.get(var)]
+
+# Tool registries are keyed by pool key (see mcp_pool_key), so servers that
+# share a connection name but run different targets never overwrite each other.
 mcp_tools = {}
-mcp_sessions = {}
+mcp_openai_tools = {}
+mcp_tool_index = {}
+mcp_validators = {}
+mcp_pool = {}
+mcp_pool_lock = asyncio.Lock()
+
+_client: AsyncAzureOpenAI | None = None
+_client_lock = asyncio.Lock()
+
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = 3600
+response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+TOOL_CACHE_SIZE = 2048
+TOOL_CACHE_TTL = 300
+CACHEABLE_TOOL_RE = re.compile(r"^(list|get|search)_")
+CACHE_CLEARING_TOOLS = {"refresh_schema"}
+tool_cache = TTLCache(maxsize=TOOL_CACHE_SIZE, ttl=TOOL_CACHE_TTL)
+
+BATCH_ENABLED = os.environ.get("AZURE_OPENAI_BATCH_ENABLED", "").lower() in ("1", "true", "yes")
+BATCH_COMMAND = "/batch"
+BATCH_POLL_INTERVAL = 30
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+TOKEN_BUDGET = 8000
+# Tool results are capped when stored (about 1000 tokens), so a single
+# result can never take up more than an eighth of the prompt budget.
+MAX_TOOL_CHARS = 4000
 
 SYSTEM_PROMPT = """Du er en spesialisert data-assistent for et internt bedriftsverktøy i Nasjonal kommunikasjonsmyndighet. DITT ENESTE FORMÅL er å svare på spørsmål om data ved hjelp av de tilgjengelige verktøyene.
 
@@ -23,130 +100,461 @@ Dine operasjonelle regler er:
 5.  **Vær konsis**: Ikke legg til unødvendig prat. Vær direkte og hjelpsom.
 """
 
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+MAX_HISTORY_MESSAGES = 200
+
+CONNECT_MESSAGE_MAX_TOOLS = 50
+CONNECT_MESSAGE_MAX_DESCRIPTION = 200
+
+def make_http_client():
+    """
+    Creates the HTTP client used by the Azure OpenAI SDK.
+
+    Prefers the aiohttp transport (``openai[aiohttp]``), which has lower
+    per-request overhead under concurrent load, and falls back to the
+    default httpx client with a raised connection limit.
+
+    Returns:
+        An async HTTP client for AsyncAzureOpenAI.
+    """
+    try:
+        return DefaultAioHttpClient()
+    except RuntimeError as e:
+        log.info("aiohttp transport unavailable (%s), using httpx", e)
+        return DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+        )
+
+async def get_client() -> AsyncAzureOpenAI:
+    """
+    Returns the shared Azure OpenAI client, creating it on first use.
+
+    A single client is reused for every message so the underlying HTTP
+    connection pool (and its TLS sessions) stays warm between requests.
+
+    Returns:
+        The process-wide AsyncAzureOpenAI client.
+    """
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                _client = AsyncAzureOpenAI(
+                    api_version=AZURE_OPENAI_API_VERSION,
+                    http_client=make_http_client(),
+                )
+    return _client
+
+@cl.on_app_shutdown
+async def close_client():
+    """
+    Closes the shared Azure OpenAI client when the Chainlit app shuts down.
+    """
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+async def warmup():
+    """
+    Opens a connection to Azure OpenAI ahead of the first message.
+
+    Creates the shared client and issues a cheap ``models.list()`` request so
+    DNS resolution, the TLS handshake and pool setup happen while the user is
+    still reading the welcome message.
+    """
+    try:
+        client = await get_client()
+        await client.models.list()
+        log.debug("Azure OpenAI connection warmed up")
+    except Exception as e:
+        log.warning("Azure OpenAI warm-up failed: %s", e)
+
 @cl.on_chat_start
 async def start_chat():
     """
     Initializes a new chat session.
 
-    This function sets up the conversation history with a system prompt and
+    This function sets up a bounded conversation history (the system prompt
+    is added to each request separately so it is never evicted) and
     validates that all required Azure OpenAI credentials are set in the
     environment.
     """
-    print("Chat session starting...")
+    log.info("Chat session starting...")
     
-    cl.user_session.set("history", [{"role": "system", "content": SYSTEM_PROMPT}])
+    cl.user_session.set("history", deque(maxlen=MAX_HISTORY_MESSAGES))
 
-    required_vars = ["AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_API_KEY", "AZURE_OPENAI_DEPLOYMENT_NAME"]
-    missing_vars = [var for var in required_vars if not os.environ.get(var)]
-    
-    if missing_vars:
+    if MISSING_ENV_VARS:
         await cl.Message(
-            content=f"**Error:** Missing Azure OpenAI environment variables: {', '.join(missing_vars)}. Please ensure they are in your `.env` file."
+            content=f"**Error:** Missing Azure OpenAI environment variables: {', '.join(MISSING_ENV_VARS)}. Please ensure they are in your `.env` file."
         ).send()
         return
 
-    print(f"Azure OpenAI Endpoint: {os.environ.get('AZURE_OPENAI_ENDPOINT')}")
-    print(f"Deployment Name: {os.environ.get('AZURE_OPENAI_DEPLOYMENT_NAME')}")
-    print(f"API Version: {os.environ.get('AZURE_OPENAI_API_VERSION', '2024-02-01')}")
+    log.info("Azure OpenAI Endpoint: %s", AZURE_OPENAI_ENDPOINT)
+    log.info("Deployment Name: %s", AZURE_OPENAI_DEPLOYMENT_NAME)
+    log.info("API Version: %s", AZURE_OPENAI_API_VERSION)
 
     await cl.Message(
         content="""Hello!"""
     ).send()
 
+    cl.user_session.set("warmup_task", asyncio.create_task(warmup()))
+
+@lru_cache(maxsize=4096)
+def to_openai_tool(name: str, description: str, schema_json: str) -> dict:
+    """
+    Converts an MCP tool description to the OpenAI function-tool format.
+
+    Memoized on the tool's name, description and canonical schema JSON, so
+    identical tools seen again on reconnect resolve to the same cached dict.
+    The returned dict is shared and must not be mutated.
+
+    Args:
+        name: The tool name.
+        description: The tool description.
+        schema_json: The tool's input schema as sort-keyed JSON.
+
+    Returns:
+        The tool in the format expected by the Chat Completions ``tools`` parameter.
+    """
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": json_loads(schema_json)
+        }
+    }
+
+def collect_openai_tools(pool_keys) -> list:
+    """
+    Collects the pre-converted OpenAI tools for a set of MCP connections.
+
+    Args:
+        pool_keys: Pool keys of the MCP connections to include.
+
+    Returns:
+        A flat list of OpenAI-format tools.
+    """
+    return [tool for key in pool_keys for tool in mcp_openai_tools.get(key, [])]
+
+def compile_validator(schema: dict):
+    """
+    Compiles a JSON Schema validator for a tool's input schema.
+
+    Args:
+        schema: The tool's ``inputSchema``.
+
+    Returns:
+        A validator instance, or None if jsonschema is unavailable or the
+        schema itself is invalid.
+    """
+    if Draft202012Validator is None or not schema:
+        return None
+    try:
+        Draft202012Validator.check_schema(schema)
+    except SchemaError as e:
+        log.warning("Ignoring invalid input schema: %s", e.message)
+        return None
+    return Draft202012Validator(schema)
+
+def mcp_pool_key(connection) -> str:
+    """
+    Builds the pool key identifying an MCP server by name and launch spec.
+
+    Args:
+        connection: The MCP connection object provided by Chainlit.
+
+    Returns:
+        A string combining the connection name with its URL or command line.
+    """
+    target = getattr(connection, "url", None) or " ".join(
+        [getattr(connection, "command", ""), *getattr(connection, "args", [])]
+    )
+    return f"{connection.name}|{target}"
+
+def register_mcp_tools(key: str, tools: list):
+    """
+    Adds a server's tools to the global tool registries.
+
+    Args:
+        key: The pool key of the server, as returned by ``mcp_pool_key``.
+        tools: The tool dictionaries discovered on the server.
+    """
+    mcp_tools[key] = tools
+    mcp_openai_tools[key] = [
+        to_openai_tool(tool["name"], tool["description"], json_dumps(tool["input_schema"])) for tool in tools
+    ]
+    for tool in tools:
+        mcp_tool_index.setdefault(tool["name"], set()).add(key)
+        mcp_validators[key, tool["name"]] = compile_validator(tool["input_schema"])
+
+def unregister_mcp_tools(key: str):
+    """
+    Removes a server's tools from the global tool registries.
+
+    Args:
+        key: The pool key of the server, as returned by ``mcp_pool_key``.
+    """
+    mcp_openai_tools.pop(key, None)
+    for tool in mcp_tools.pop(key, []):
+        owners = mcp_tool_index.get(tool["name"], set())
+        owners.discard(key)
+        if not owners:
+            mcp_tool_index.pop(tool["name"], None)
+        mcp_validators.pop((key, tool["name"]), None)
+
+async def discover_mcp_tools(mcp_name: str, key: str, session: ClientSession) -> list:
+    """
+    Lists a server's tools and registers them globally.
+
+    Args:
+        mcp_name: The name of the MCP connection.
+        key: The pool key of the server, as returned by ``mcp_pool_key``.
+        session: The active ClientSession for the connection.
+
+    Returns:
+        The list of tool dictionaries for the server.
+    """
+    result = await session.list_tools()
+    log.info("Found %d tools from %s", len(result.tools), mcp_name)
+
+    tools = []
+    for tool in result.tools:
+        tool_info = {
+            "name": tool.name,
+            "description": tool.description,
+            "input_schema": tool.inputSchema,
+        }
+        tools.append(tool_info)
+        log.debug("   - %s: %s", tool.name, tool.description)
+
+    register_mcp_tools(key, tools)
+    return tools
+
+async def acquire_mcp_tools(connection, session: ClientSession) -> list:
+    """
+    Returns the tools for an MCP server, discovering them on first connect.
+
+    Tool discovery is shared between all users connected to the same server
+    spec: only the first connection calls ``list_tools()``, later ones await
+    the same discovery task and increment its reference count. The pool lock
+    only guards the bookkeeping, so servers that connect at the same time
+    list their tools concurrently.
+
+    Args:
+        connection: The MCP connection object provided by Chainlit.
+        session: The active ClientSession for the connection.
+
+    Returns:
+        The list of tool dictionaries for the server.
+    """
+    key = mcp_pool_key(connection)
+    async with mcp_pool_lock:
+        entry = mcp_pool.get(key)
+        if entry is None:
+            entry = {"discovery": asyncio.create_task(discover_mcp_tools(connection.name, key, session)), "refs": 0}
+            mcp_pool[key] = entry
+        else:
+            log.info("Reusing pooled tools for %s", connection.name)
+        entry["refs"] += 1
+
+    try:
+        return await asyncio.shield(entry["discovery"])
+    except Exception:
+        async with mcp_pool_lock:
+            if mcp_pool.get(key) is entry:
+                del mcp_pool[key]
+        raise
+
+async def release_mcp_tools(key: str):
+    """
+    Drops one reference to a pooled MCP server.
+
+    The server's tools are unregistered when the last user disconnects.
+
+    Args:
+        key: The pool key returned by ``mcp_pool_key``.
+    """
+    async with mcp_pool_lock:
+        entry = mcp_pool.get(key)
+        if entry is None:
+            return
+        entry["refs"] -= 1
+        if entry["refs"] <= 0:
+            del mcp_pool[key]
+            if entry["discovery"].done():
+                unregister_mcp_tools(key)
+            else:
+                entry["discovery"].cancel()
+
 @cl.on_mcp_connect
 async def on_mcp_connect(connection, session: ClientSession):
     """
     Handles a new MCP server connection.
 
-    Fetches the list of available tools from the connected server, stores them
-    in the global and user session state, and notifies the user.
+    Gets the server's tools from the shared pool (listing them if this is
+    the first connection to the server), stores the session in the user
+    session state, and notifies the user. The tool definitions themselves
+    stay in the module-level registries and are looked up per message.
+
+    When the name is already connected (Chainlit reconnects by connecting
+    the new session before disconnecting the old one), the old session's
+    pool reference is released here, and the later disconnect for the old
+    session is ignored.
 
     Args:
         connection: The MCP connection object provided by Chainlit.
         session: The active ClientSession for the connection.
     """
-    print(f"MCP connection established: {connection.name}")
+    log.info("MCP connection established: %s", connection.name)
     
     try:
-        result = await session.list_tools()
-        print(f"Found {len(result.tools)} tools from {connection.name}")
-        
-        tools = []
-        for tool in result.tools:
-            tool_info = {
-                "name": tool.name,
-                "description": tool.description,
-                "input_schema": tool.inputSchema,
-            }
-            tools.append(tool_info)
-            print(f"   - {tool.name}: {tool.description}")
+        user_pool_keys = cl.user_session.get("mcp_pool_keys", {})
+        user_mcp_sessions = cl.user_session.get("mcp_sessions", {})
+        if connection.name in user_pool_keys:
+            user_mcp_sessions.pop(connection.name, None)
+            await release_mcp_tools(user_pool_keys.pop(connection.name))
+
+        tools = await acquire_mcp_tools(connection, session)
+        user_pool_keys[connection.name] = mcp_pool_key(connection)
+        cl.user_session.set("mcp_pool_keys", user_pool_keys)
+
+        user_mcp_sessions[connection.name] = session
+        cl.user_session.set("mcp_sessions", user_mcp_sessions)
         
-        mcp_tools[connection.name] = tools
-        mcp_sessions[connection.name] = session
-        
-        user_mcp_tools = cl.user_session.get("mcp_tools", {})
-        user_mcp_tools[connection.name] = tools
-        cl.user_session.set("mcp_tools", user_mcp_tools)
-        
-        await cl.Message(
-            content=f"Successfully connected to **{connection.name}** MCP server!\n\nAvailable tools:\n" + 
-                   "\n".join([f"• **{tool['name']}**: {tool['description']}" for tool in tools])
-        ).send()
+        buf = io.StringIO()
+        buf.write(f"Successfully connected to **{connection.name}** MCP server!\n\nAvailable tools ({len(tools)}):\n")
+        for tool in tools[:CONNECT_MESSAGE_MAX_TOOLS]:
+            buf.write(f"• **{tool['name']}**: {(tool['description'] or '')[:CONNECT_MESSAGE_MAX_DESCRIPTION]}\n")
+        if len(tools) > CONNECT_MESSAGE_MAX_TOOLS:
+            buf.write(f"... and {len(tools) - CONNECT_MESSAGE_MAX_TOOLS} more\n")
+        await cl.Message(content=buf.getvalue()).send()
         
     except Exception as e:
-        print(f"Error connecting to MCP server {connection.name}: {e}")
+        log.error("Error connecting to MCP server %s: %s", connection.name, e)
         await cl.Message(
             content=f"Error connecting to MCP server {connection.name}: {str(e)}"
         ).send()
 
 @cl.on_mcp_disconnect
-async def on_mcp_disconnect(connection):
+async def on_mcp_disconnect(name: str, session: ClientSession):
     """
     Handles an MCP server disconnection.
 
-    Cleans up the disconnected server's tools and session from the global
-    and user session state and notifies the user.
+    Releases the user's reference to the pooled server and removes the
+    session from the user session state, then notifies the user. A closed
+    session that has already been replaced by a reconnect is ignored, since
+    on_mcp_connect released its reference.
 
     Args:
-        connection: The MCP connection object that was disconnected.
+        name: The name of the MCP connection that was disconnected.
+        session: The ClientSession that was closed.
     """
-    print(f"MCP connection closed: {connection.name}")
-    
-    if connection.name in mcp_tools:
-        del mcp_tools[connection.name]
-    if connection.name in mcp_sessions:
-        del mcp_sessions[connection.name]
-    
-    user_mcp_tools = cl.user_session.get("mcp_tools", {})
-    if connection.name in user_mcp_tools:
-        del user_mcp_tools[connection.name]
-    cl.user_session.set("mcp_tools", user_mcp_tools)
+    log.info("MCP connection closed: %s", name)
+
+    user_mcp_sessions = cl.user_session.get("mcp_sessions", {})
+    if user_mcp_sessions.get(name) is not session:
+        log.debug("Ignoring disconnect of replaced MCP session: %s", name)
+        return
+    del user_mcp_sessions[name]
+    cl.user_session.set("mcp_sessions", user_mcp_sessions)
+
+    user_pool_keys = cl.user_session.get("mcp_pool_keys", {})
+    if name in user_pool_keys:
+        await release_mcp_tools(user_pool_keys.pop(name))
+    cl.user_session.set("mcp_pool_keys", user_pool_keys)
     
     await cl.Message(
-        content=f"Disconnected from **{connection.name}** MCP server."
+        content=f"Disconnected from **{name}** MCP server."
     ).send()
 
-def find_mcp_for_tool(tool_name: str) -> str:
+def find_mcp_for_tool(tool_name: str, user_pool_keys: dict) -> str:
     """
-    Finds which MCP connection provides a specific tool.
+    Finds which of the user's MCP connections provides a specific tool.
 
     Args:
         tool_name: The name of the tool to find.
+        user_pool_keys: The user's connection names mapped to their pool keys.
 
     Returns:
         The name of the MCP connection that provides the tool, or None if not found.
     """
-    for mcp_name, tools in mcp_tools.items():
-        for tool in tools:
-            if tool["name"] == tool_name:
-                return mcp_name
-    return None
+    owners = mcp_tool_index.get(tool_name, ())
+    return next((name for name, key in user_pool_keys.items() if key in owners), None)
+
+def response_cache_key(history: deque, tools_sig: str) -> str:
+    """
+    Builds the response cache key for the current turn.
+
+    The key hashes the whole conversation together with the names of the
+    tools the model can see, so the same question in the same context maps
+    to the same cached answer. Entries expire after RESPONSE_CACHE_TTL
+    seconds so answers about live data do not go stale indefinitely.
+
+    Args:
+        history: The conversation history, ending with the new user message.
+        tools_sig: Comma-separated, sorted names of the available tools.
+
+    Returns:
+        A hex digest identifying the turn.
+    """
+    digest = hashlib.blake2b(json_dumps(list(history)).encode())
+    digest.update(tools_sig.encode())
+    return digest.hexdigest()
+
+def tool_text(result) -> str:
+    """
+    Extracts the text of an MCP tool result without extra copies.
+
+    Text blocks are returned as-is. Structured content and non-text blocks
+    are serialized as compact JSON rather than a Python ``repr``, which is
+    smaller and easier for the model to read.
+
+    Args:
+        result: The CallToolResult returned by the MCP session.
+
+    Returns:
+        The text of the first content block, or a placeholder when empty.
+    """
+    content = getattr(result, "content", None)
+    if content:
+        first = content[0]
+        text = getattr(first, "text", None)
+        if isinstance(text, str):
+            return text
+    structured = getattr(result, "structuredContent", None)
+    if structured is not None:
+        return json_dumps(structured)
+    if not content:
+        return "Tool executed, but returned no content."
+    if hasattr(first, "model_dump"):
+        return json_dumps(first.model_dump(mode="json", exclude_none=True))
+    return str(first)
+
+def clear_tool_cache(pool_key: str):
+    """
+    Drops all cached tool results of one MCP server.
+
+    Args:
+        pool_key: The pool key of the server, as returned by ``mcp_pool_key``.
+    """
+    for key in [key for key in tool_cache.keys() if key[0] == pool_key]:
+        tool_cache.pop(key, None)
 
 @cl.step(type="tool")
 async def call_mcp_tool(tool_name: str, tool_input: dict):
     """
     Executes a specific tool on its corresponding MCP server.
 
+    Arguments are first checked against the tool's input schema, so invalid
+    model output is rejected without a round trip to the MCP server.
+    Successful results of read-only tools (``list_*``, ``get_*``,
+    ``search_*``) are kept in a short-lived cache keyed by the MCP server,
+    the tool name and its canonical arguments. Results the server flags
+    with ``isError`` are never cached. Calling one of CACHE_CLEARING_TOOLS
+    (e.g. ``refresh_schema``) drops the cached results of that server.
+
     Args:
         tool_name: The name of the tool to execute.
         tool_input: The dictionary of arguments for the tool.
@@ -157,24 +565,302 @@ async def call_mcp_tool(tool_name: str, tool_input: dict):
     Raises:
         ValueError: If no MCP connection is found for the tool or session.
     """
-    print(f"Calling MCP tool: {tool_name} with input: {tool_input}")
-    
-    mcp_name = find_mcp_for_tool(tool_name)
+    log.debug("Calling MCP tool: %s with input: %s", tool_name, tool_input)
+
+    user_pool_keys = cl.user_session.get("mcp_pool_keys", {})
+    mcp_name = find_mcp_for_tool(tool_name, user_pool_keys)
     if not mcp_name:
         raise ValueError(f"No MCP connection found for tool: {tool_name}")
     
-    session = mcp_sessions.get(mcp_name)
+    session = cl.user_session.get("mcp_sessions", {}).get(mcp_name)
     if not session:
         raise ValueError(f"No active session for MCP connection: {mcp_name}")
     
+    pool_key = user_pool_keys[mcp_name]
+    validator = mcp_validators.get((pool_key, tool_name))
+    if validator is not None:
+        error = best_match(validator.iter_errors(tool_input))
+        if error is not None:
+            log.debug("Invalid arguments for %s: %s", tool_name, error.message)
+            return f"Invalid arguments for tool {tool_name}: {error.message}"
+
+    cacheable = bool(CACHEABLE_TOOL_RE.match(tool_name))
+    if cacheable:
+        cache_key = (pool_key, tool_name, json_dumps(tool_input))
+        cached_output = tool_cache.get(cache_key)
+        if cached_output is not None:
+            log.debug("Tool cache hit for %s", tool_name)
+            return cached_output
+    
     try:
         result = await session.call_tool(tool_name, tool_input)
-        print(f"Tool {tool_name} executed successfully")
-        return result.content[0].text if result.content else "Tool executed, but returned no content."
+        log.debug("Tool %s executed successfully", tool_name)
+        output = tool_text(result)
+        if cacheable and not result.isError:
+            tool_cache[cache_key] = output
+        elif tool_name in CACHE_CLEARING_TOOLS:
+            clear_tool_cache(pool_key)
+        return output
     except Exception as e:
-        print(f"Error executing tool {tool_name}: {e}")
+        log.error("Error executing tool %s: %s", tool_name, e)
         raise
 
+def count_tokens(text: str) -> int:
+    """
+    Counts the tokens in a piece of text.
+
+    Uses the cl100k_base encoding when tiktoken is available, otherwise
+    falls back to a rough four-characters-per-token estimate.
+
+    Args:
+        text: The text to count.
+
+    Returns:
+        The (estimated) number of tokens.
+    """
+    if not text:
+        return 0
+    if _encoding is None:
+        return len(text) // 4 + 1
+    return len(_encoding.encode(text))
+
+def message_tokens(message: dict) -> int:
+    """
+    Estimates the number of prompt tokens a history message will use.
+
+    Args:
+        message: A chat message dictionary.
+
+    Returns:
+        The token count of the content and any tool call arguments.
+    """
+    tokens = count_tokens(message.get("content") or "")
+    for tool_call in message.get("tool_calls") or []:
+        tokens += count_tokens(tool_call["function"]["arguments"])
+    return tokens + 4
+
+def compact_history(history: deque, budget: int) -> list:
+    """
+    Builds a token-bounded copy of the history to send to Azure OpenAI.
+
+    The system prompt and the current turn (the latest user message and
+    everything after it) are always kept. Earlier turns are added newest
+    first while they fit within the budget; tool results in them are
+    already capped by truncate_tool_output. If any turns are
+    dropped, a marker message takes their place. The canonical
+    history is left untouched so follow-up questions still have the full
+    context locally.
+
+    Args:
+        history: The conversation history, without the system prompt.
+        budget: The maximum number of prompt tokens to aim for.
+
+    Returns:
+        A new list of messages to use as the request payload.
+    """
+    system, turns = SYSTEM_MESSAGE, list(history)
+    last_user = max((i for i, m in enumerate(turns) if m["role"] == "user"), default=0)
+    current, earlier = turns[last_user:], turns[:last_user]
+
+    used = message_tokens(system) + sum(message_tokens(m) for m in current)
+    kept = []
+    for message in reversed(earlier):
+        cost = message_tokens(message)
+        if used + cost > budget:
+            break
+        kept.append(message)
+        used += cost
+    kept.reverse()
+
+    # Start the window on a user message so tool results are never sent
+    # without the assistant message that requested them.
+    while kept and kept[0]["role"] != "user":
+        kept.pop(0)
+
+    if len(kept) < len(earlier):
+        kept.insert(0, {"role": "system", "content": "[Older turns omitted]"})
+
+    return [system] + kept + current
+
+def truncate_tool_output(content: str) -> str:
+    """
+    Caps a tool result before it is stored in the history.
+
+    Args:
+        content: The tool output.
+
+    Returns:
+        The output, cut to MAX_TOOL_CHARS with a note of how much was dropped.
+    """
+    if len(content) <= MAX_TOOL_CHARS:
+        return content
+    return content[:MAX_TOOL_CHARS] + f"\n…[truncated {len(content) - MAX_TOOL_CHARS} chars]"
+
+async def execute_tool_call(tool_call: dict) -> str:
+    """
+    Parses the arguments of a single model tool call and executes it.
+
+    Args:
+        tool_call: A tool call entry from the assistant message.
+
+    Returns:
+        A string containing the tool's output.
+    """
+    tool_name = tool_call["function"]["name"]
+    tool_input = json_loads(tool_call["function"]["arguments"] or "{}")
+    log.debug("   - Executing tool: %s", tool_name)
+    return await call_mcp_tool(tool_name, tool_input)
+
+async def stream_completion(client: AsyncAzureOpenAI, **request_params) -> dict:
+    """
+    Streams a chat completion, forwarding answer tokens to the chat.
+
+    Content deltas are streamed into a Chainlit message as they arrive (the
+    message is only created once there is content to show). Tool call
+    deltas are accumulated by index and reassembled into complete tool
+    calls.
+
+    Args:
+        client: The Azure OpenAI client to use.
+        **request_params: Parameters for ``chat.completions.create``.
+
+    Returns:
+        The assistant message as a minimal history entry with role, content
+        and (if the model requested any) tool calls.
+    """
+    stream = await client.chat.completions.create(**request_params, stream=True)
+
+    msg = None
+    content = []
+    tool_calls = {}
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            if msg is None:
+                msg = cl.Message(content="")
+            content.append(delta.content)
+            await msg.stream_token(delta.content)
+        for tool_call in delta.tool_calls or []:
+            entry = tool_calls.setdefault(
+                tool_call.index,
+                {"id": None, "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if tool_call.id:
+                entry["id"] = tool_call.id
+            if tool_call.function:
+                entry["function"]["name"] += tool_call.function.name or ""
+                entry["function"]["arguments"] += tool_call.function.arguments or ""
+
+    if msg is not None:
+        # send() (not update()) so the streamed message is also persisted
+        # to the data layer and shows up in the thread history.
+        await msg.send()
+
+    # Content may only be null on messages that carry tool calls.
+    text = "".join(content)
+    message = {"role": "assistant", "content": text if text or not tool_calls else None}
+    if tool_calls:
+        message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+    return message
+
+async def submit_batch(requests: list[dict]) -> list[dict]:
+    """
+    Runs a list of chat completion requests through the Azure OpenAI Batch API.
+
+    Intended for offline or bulk workloads (evaluation runs, re-indexing)
+    where a 24h completion window is acceptable. Azure requires a global
+    batch deployment and API version 2024-07-01-preview or later.
+
+    Args:
+        requests: Chat completion request bodies (messages and optional
+            parameters). The deployment name is filled in automatically.
+
+    Returns:
+        One result dictionary per request, in input order, with either a
+        ``content`` or an ``error`` key.
+
+    Raises:
+        RuntimeError: If the batch job does not complete successfully.
+    """
+    client = await get_client()
+
+    # Azure's batch endpoint paths have no /v1 prefix.
+    lines = [
+        json_dumps({
+            "custom_id": f"request-{i}",
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {"model": AZURE_OPENAI_DEPLOYMENT_NAME, **body},
+        })
+        for i, body in enumerate(requests)
+    ]
+    batch_file = await client.files.create(file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/chat/completions",
+        completion_window="24h",
+    )
+    log.info("Submitted batch %s with %d requests", batch.id, len(requests))
+
+    while batch.status not in BATCH_TERMINAL_STATUSES:
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        batch = await client.batches.retrieve(batch.id)
+        log.debug("Batch %s status: %s", batch.id, batch.status)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} finished with status: {batch.status}")
+
+    output = await client.files.content(batch.output_file_id)
+    results = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        item = json_loads(line)
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            results[item["custom_id"]] = {"error": item.get("error") or response.get("body")}
+        else:
+            results[item["custom_id"]] = {"content": response["body"]["choices"][0]["message"]["content"]}
+
+    return [
+        {"custom_id": f"request-{i}", **results.get(f"request-{i}", {"error": "No result returned"})}
+        for i in range(len(requests))
+    ]
+
+async def run_batch(prompts: list[str]):
+    """
+    Answers a list of prompts offline through the Batch API.
+
+    Triggered by a ``/batch`` message when AZURE_OPENAI_BATCH_ENABLED is
+    set. Each prompt is sent with the system prompt only; tools are not
+    available in batch mode, and the batch is not added to the history.
+
+    Args:
+        prompts: The prompts to answer, one request each.
+    """
+    if not prompts:
+        await cl.Message(content="No prompts provided for batch processing.").send()
+        return
+
+    await cl.Message(content=f"Submitted {len(prompts)} prompts for batch processing...").send()
+    try:
+        results = await submit_batch([
+            {"messages": [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}]}
+            for prompt in prompts
+        ])
+    except Exception as e:
+        log.error("Batch processing failed: %s", e)
+        await cl.Message(content=f"Batch processing failed: {str(e)}").send()
+        return
+
+    answers = []
+    for prompt, result in zip(prompts, results):
+        answer = result["content"] if "content" in result else f"Error: {result['error']}"
+        answers.append(f"**{prompt}**\n{answer}")
+    await cl.Message(content="\n\n".join(answers)).send()
+
 @cl.on_message
 async def main(message: cl.Message):
     """
@@ -182,80 +868,82 @@ async def main(message: cl.Message):
 
     This function receives a user message, prepares the context and available
     tools, calls the Azure OpenAI model, and then handles the model's response,
-    which may include executing tool calls.
+    which may include executing tool calls. Responses are streamed to the
+    chat as they are generated, and multiple tool calls in one response are
+    executed concurrently.
     
     Args:
         message: The user's incoming message object.
     """
+    warmup_task = cl.user_session.get("warmup_task")
+    if warmup_task is not None:
+        # Let a warm-up that is still connecting finish instead of opening a
+        # second connection; it is only waited for on the first message.
+        cl.user_session.set("warmup_task", None)
+        await warmup_task
+
+    if BATCH_ENABLED and message.content.startswith(BATCH_COMMAND):
+        lines = message.content[len(BATCH_COMMAND):].splitlines()
+        await run_batch([line.strip() for line in lines if line.strip()])
+        return
+
     history = cl.user_session.get("history")
     history.append({"role": "user", "content": message.content})
 
     try:
-        client = AsyncAzureOpenAI(
-            api_version=os.environ.get("AZURE_OPENAI_API_VERSION", "2024-02-01"),
-        )
+        client = await get_client()
 
-        print(f"Making request to Azure OpenAI with {len(history)} messages")
-        print(f"Message content: {message.content}")
-        
-        openai_tools = []
-        user_mcp_tools = cl.user_session.get("mcp_tools", {})
+        log.debug("Making request to Azure OpenAI with %d messages", len(history))
+        log.debug("Message content: %s", message.content)
         
-        for mcp_name, tools in user_mcp_tools.items():
-            for tool in tools:
-                openai_tool = {
-                    "type": "function",
-                    "function": {
-                        "name": tool["name"],
-                        "description": tool["description"],
-                        "parameters": tool["input_schema"]
-                    }
-                }
-                openai_tools.append(openai_tool)
+        openai_tools = collect_openai_tools(cl.user_session.get("mcp_pool_keys", {}).values())
         
-        print(f"Available tools: {len(openai_tools)}")
-        for tool in openai_tools:
-            print(f"   - {tool['function']['name']}")
+        log.debug("Available tools: %d", len(openai_tools))
+        if log.isEnabledFor(logging.DEBUG):
+            for tool in openai_tools:
+                log.debug("   - %s", tool["function"]["name"])
         
+        tools_sig = ",".join(sorted(tool["function"]["name"] for tool in openai_tools))
+        cache_key = response_cache_key(history, tools_sig)
+        cached_content = response_cache.get(cache_key)
+        if cached_content is not None:
+            log.debug("Response cache hit")
+            history.append({"role": "assistant", "content": cached_content})
+            await cl.Message(content=cached_content).send()
+            return
+
         request_params = {
-            "messages": history,
-            "model": os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME"),
+            "messages": compact_history(history, TOKEN_BUDGET),
+            "model": AZURE_OPENAI_DEPLOYMENT_NAME,
         }
         
         if openai_tools:
             request_params["tools"] = openai_tools
             request_params["tool_choice"] = "auto"
         
-        response = await client.chat.completions.create(**request_params)
+        response_message = await stream_completion(client, **request_params)
 
-        print(f"Received response from Azure OpenAI")
-        response_message = response.choices[0].message
+        log.debug("Received response from Azure OpenAI")
+        history.append(response_message)
         
-        if hasattr(response_message, 'tool_calls') and response_message.tool_calls:
-            print(f"Tool calls detected: {len(response_message.tool_calls)}")
-            
-            history.append(response_message.model_dump())
+        if response_message.get("tool_calls"):
+            tool_calls = response_message["tool_calls"]
+            log.debug("Tool calls detected: %d", len(tool_calls))
             
+            results = await asyncio.gather(
+                *[execute_tool_call(tool_call) for tool_call in tool_calls],
+                return_exceptions=True,
+            )
+
             tool_outputs = []
-            for tool_call in response_message.tool_calls:
-                tool_name = tool_call.function.name
-                tool_input = json.loads(tool_call.function.arguments)
-                
-                print(f"   - Executing tool: {tool_name}")
-                
-                try:
-                    tool_output = await call_mcp_tool(tool_name, tool_input)
-                    tool_outputs.append({
-                        "tool_call_id": tool_call.id,
-                        "output": tool_output
-                    })
-                    
-                except Exception as e:
-                    print(f"Tool execution failed: {e}")
-                    tool_outputs.append({
-                        "tool_call_id": tool_call.id,
-                        "output": f"Error executing tool: {str(e)}"
-                    })
+            for tool_call, result in zip(tool_calls, results):
+                if isinstance(result, Exception):
+                    log.error("Tool execution failed: %s", result)
+                    result = f"Error executing tool: {str(result)}"
+                tool_outputs.append({
+                    "tool_call_id": tool_call["id"],
+                    "output": result
+                })
             
             # Om vi bruker en indirekte måte å oppsummere på får vi mer
             # konversasjonell chatbot - men den sliter med å formatere markdown
@@ -267,12 +955,15 @@ async def main(message: cl.Message):
 
             # --- Direkte: Ikke oppsummer ---
 
+            # await asyncio.gather(*[
+            #     cl.Message(author=tool_call["function"]["name"], content=tool_output_data["output"]).send()
+            #     for tool_call, tool_output_data in zip(tool_calls, tool_outputs)
+            # ])
             # for tool_output_data in tool_outputs:
-            #     await cl.Message(author=tool_name, content=tool_output_data["output"]).send()
             #     history.append({
             #         "role": "tool",
             #         "tool_call_id": tool_output_data["tool_call_id"],
-            #         "content": tool_output_data["output"]
+            #         "content": truncate_tool_output(tool_output_data["output"])
             #     })
             
             # --- Indirekte: Lar AIen oppsummere (mer konversasjonell) ---
@@ -282,23 +973,21 @@ async def main(message: cl.Message):
                 history.append({
                     "role": "tool",
                     "tool_call_id": tool_output_data["tool_call_id"],
-                    "content": tool_output_data["output"]
+                    "content": truncate_tool_output(tool_output_data["output"])
                 })
 
-            final_response = await client.chat.completions.create(
-                messages=history,
-                model=os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME"),
+            final_message = await stream_completion(
+                client,
+                messages=compact_history(history, TOKEN_BUDGET),
+                model=AZURE_OPENAI_DEPLOYMENT_NAME,
             )
-            
-            final_message = final_response.choices[0].message
-            history.append(final_message.model_dump())
-            await cl.Message(content=final_message.content).send()            
+            history.append(final_message)
         else:
-            print("No tool calls in response")
-            history.append(response_message.model_dump())
-            await cl.Message(content=response_message.content).send()
+            log.debug("No tool calls in response")
+            if response_message["content"]:
+                response_cache[cache_key] = response_message["content"]
 
     except Exception as e:
         error_details = traceback.format_exc()
-        print(f"Full error details: {error_details}")
+        log.error("Full error details: %s", error_details)
         await cl.Message(content=f"An error occurred: {str(e)}\n\nFull error: {error_details}").send()
@@ -2,6 +2,15 @@ from typing import Any, Dict, Optional
 
 import httpx
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    _loads = json.loads
+
 
 class OpenMetadataError(Exception):
     """Base exception for OpenMetadata client errors."""
@@ -9,6 +18,50 @@ class OpenMetadataError(Exception):
     pass
 
 
+def _decode(response: httpx.Response) -> Dict[str, Any]:
+    """Decode a JSON response body, using orjson when it is installed."""
+    return _loads(response.content)
+
+
+def _auth_headers(api_token: Optional[str], username: Optional[str], password: Optional[str]) -> Dict[str, str]:
+    """Build the authentication headers shared by the sync and async clients.
+
+    Raises:
+        OpenMetadataError: If neither API token nor username/password is provided
+    """
+    if api_token:
+        return {"Authorization": f"Bearer {api_token}"}
+    if username and password:
+        return {}
+    raise OpenMetadataError("Either API token or username/password must be provided")
+
+
+def _http_limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async clients."""
+    return httpx.Limits(max_keepalive_connections=8, max_connections=16, keepalive_expiry=60)
+
+
+def _list_tables_params(
+    limit: int,
+    offset: int,
+    fields: Optional[str],
+    database: Optional[str],
+    include_deleted: bool,
+    after: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build the query parameters for the list tables endpoint."""
+    params = {"limit": min(max(1, limit), 1000000), "offset": max(0, offset)}
+    if after:
+        params["after"] = after
+    if fields:
+        params["fields"] = fields
+    if database:
+        params["database"] = database
+    if include_deleted:
+        params["include"] = "all"
+    return params
+
+
 class OpenMetadataClient:
     """Client for interacting with OpenMetadata API."""
 
@@ -27,14 +80,12 @@ class OpenMetadataClient:
             OpenMetadataError: If neither API token nor username/password is provided
         """
         self.host = host.rstrip("/")
-        self.session = httpx.Client()
+        headers = _auth_headers(api_token, username, password)
+        self.session = httpx.Client(headers=headers, limits=_http_limits())
 
-        if api_token:
-            self.session.headers["Authorization"] = f"Bearer {api_token}"
-        elif username and password:
-            pass
-        else:
-            raise OpenMetadataError("Either API token or username/password must be provided")
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
 
     def list_tables(
         self,
@@ -43,6 +94,7 @@ class OpenMetadataClient:
         fields: Optional[str] = None,
         database: Optional[str] = None,
         include_deleted: bool = False,
+        after: Optional[str] = None,
     ) -> Dict[str, Any]:
         """List tables with pagination.
 
@@ -52,6 +104,7 @@ class OpenMetadataClient:
             fields: Comma-separated list of fields to include
             database: Filter tables by database fully qualified name
             include_deleted: Whether to include deleted tables
+            after: Paging cursor from a previous response's ``paging.after``
 
         Returns:
             Dictionary containing table list and metadata
@@ -59,17 +112,11 @@ class OpenMetadataClient:
         Raises:
             OpenMetadataError: If the API request fails
         """
-        params = {"limit": min(max(1, limit), 1000000), "offset": max(0, offset)}
-        if fields:
-            params["fields"] = fields
-        if database:
-            params["database"] = database
-        if include_deleted:
-            params["include"] = "all"
+        params = _list_tables_params(limit, offset, fields, database, include_deleted, after)
 
         response = self.session.get(f"{self.host}/api/v1/tables", params=params)
         response.raise_for_status()
-        return response.json()
+        return _decode(response)
 
     def get_table(self, table_id: str, fields: Optional[str] = None) -> Dict[str, Any]:
         """Get details of a specific table by ID.
@@ -90,7 +137,7 @@ class OpenMetadataClient:
 
         response = self.session.get(f"{self.host}/api/v1/tables/{table_id}", params=params)
         response.raise_for_status()
-        return response.json()
+        return _decode(response)
 
     def get_table_by_name(self, fqn: str, fields: Optional[str] = None) -> Dict[str, Any]:
         """Get details of a specific table by fully qualified name.
@@ -111,7 +158,7 @@ class OpenMetadataClient:
 
         response = self.session.get(f"{self.host}/api/v1/tables/name/{fqn}", params=params)
         response.raise_for_status()
-        return response.json()
+        return _decode(response)
 
     def create_table(self, table_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new table.
@@ -127,7 +174,7 @@ class OpenMetadataClient:
         """
         response = self.session.post(f"{self.host}/api/v1/tables", json=table_data)
         response.raise_for_status()
-        return response.json()
+        return _decode(response)
 
     def update_table(self, table_id: str, table_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing table.
@@ -144,7 +191,7 @@ class OpenMetadataClient:
         """
         response = self.session.put(f"{self.host}/api/v1/tables/{table_id}", json=table_data)
         response.raise_for_status()
-        return response.json()
+        return _decode(response)
 
     def delete_table(self, table_id: str, hard_delete: bool = False, recursive: bool = False) -> None:
         """Delete a table.
@@ -160,3 +207,74 @@ class OpenMetadataClient:
         params = {"hardDelete": hard_delete, "recursive": recursive}
         response = self.session.delete(f"{self.host}/api/v1/tables/{table_id}", params=params)
         response.raise_for_status()
+
+
+class AsyncOpenMetadataClient:
+    """Asynchronous client for the read endpoints of the OpenMetadata API."""
+
+    def __init__(
+        self, host: str, api_token: Optional[str] = None, username: Optional[str] = None, password: Optional[str] = None
+    ):
+        """Initialize the async OpenMetadata client.
+
+        Args:
+            host: OpenMetadata host URL
+            api_token: API token for authentication
+            username: Username for basic auth
+            password: Password for basic auth
+
+        Raises:
+            OpenMetadataError: If neither API token nor username/password is provided
+        """
+        self.host = host.rstrip("/")
+        headers = _auth_headers(api_token, username, password)
+        self.session = httpx.AsyncClient(headers=headers, limits=_http_limits())
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        await self.session.aclose()
+
+    async def list_tables(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        fields: Optional[str] = None,
+        database: Optional[str] = None,
+        include_deleted: bool = False,
+        after: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """List tables with pagination.
+
+        See OpenMetadataClient.list_tables for the arguments.
+        """
+        params = _list_tables_params(limit, offset, fields, database, include_deleted, after)
+
+        response = await self.session.get(f"{self.host}/api/v1/tables", params=params)
+        response.raise_for_status()
+        return _decode(response)
+
+    async def get_table(self, table_id: str, fields: Optional[str] = None) -> Dict[str, Any]:
+        """Get details of a specific table by ID.
+
+        See OpenMetadataClient.get_table for the arguments.
+        """
+        params = {}
+        if fields:
+            params["fields"] = fields
+
+        response = await self.session.get(f"{self.host}/api/v1/tables/{table_id}", params=params)
+        response.raise_for_status()
+        return _decode(response)
+
+    async def get_table_by_name(self, fqn: str, fields: Optional[str] = None) -> Dict[str, Any]:
+        """Get details of a specific table by fully qualified name.
+
+        See OpenMetadataClient.get_table_by_name for the arguments.
+        """
+        params = {}
+        if fields:
+            params["fields"] = fields
+
+        response = await self.session.get(f"{self.host}/api/v1/tables/name/{fqn}", params=params)
+        response.raise_for_status()
+        return _decode(response)
@@ -1,13 +1,13 @@
 import asyncio
 import sys
 import os
-import json
-from typing import Any, Dict, List, Optional
+import re
+from urllib.parse import urlsplit
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 import logging
-from concurrent.futures import ThreadPoolExecutor
 
 from mcp.server import Server
-from mcp.types import Resource, TextContent, Tool
+from mcp.types import CallToolResult, Resource, TextContent, Tool
 import mcp.server.stdio
 
 try:
@@ -16,167 +16,261 @@ except ImportError:
     print("Warning: asyncpg not installed. Install with: pip install asyncpg")
     sys.exit(1)
 
+from async_lru import alru_cache
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError:
     print("Warning: python-dotenv not installed. Install with: pip install python-dotenv")
 
+MCP_POSTGRES_URL = os.getenv("MCP_POSTGRES_URL")
+MCP_PG_POOL_MIN = int(os.getenv("MCP_PG_POOL_MIN", "5"))
+MCP_PG_POOL_MAX = int(os.getenv("MCP_PG_POOL_MAX", "32"))
+
+MAX_ROWS = 500
+_SELECT_RE = re.compile(r"^\s*(?:select|with)\b", re.IGNORECASE)
+_TABLE_RE = re.compile(r"\w+(?:\.\w+)?")
+
 class PostgresManager:
     """
     A class to manage the asyncpg connection pool.
     """
     _pool = None
+    _lock = asyncio.Lock()
 
     @classmethod
     async def get_pool(cls) -> asyncpg.Pool:
         """
         Initializes and returns the connection pool using the MCP_POSTGRES_URL.
+
+        The pool size can be tuned with MCP_PG_POOL_MIN and MCP_PG_POOL_MAX.
         """
         if cls._pool is None:
-            conn_string = os.getenv('MCP_POSTGRES_URL')
-            if not conn_string:
-                raise ValueError("MCP_POSTGRES_URL is not set in the environment.")
-            cls._pool = await asyncpg.create_pool(conn_string, min_size=1, max_size=10)
-            logging.info("PostgreSQL connection pool created successfully.")
+            async with cls._lock:
+                if cls._pool is None:
+                    if not MCP_POSTGRES_URL:
+                        raise ValueError("MCP_POSTGRES_URL is not set in the environment.")
+                    cls._pool = await asyncpg.create_pool(
+                        MCP_POSTGRES_URL,
+                        min_size=MCP_PG_POOL_MIN,
+                        max_size=MCP_PG_POOL_MAX,
+                        max_inactive_connection_lifetime=300,
+                        command_timeout=30,
+                        statement_cache_size=1024,
+                        max_cached_statement_lifetime=0,
+                    )
+                    logging.info("PostgreSQL connection pool created successfully.")
         return cls._pool
 
-async def execute_query(query: str, *args):
+    @classmethod
+    async def close(cls):
+        """
+        Closes the connection pool if it has been created.
+        """
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+            logging.info("PostgreSQL connection pool closed.")
+
+async def execute_query(query: str, *args) -> List[asyncpg.Record]:
     """
     Executes a query using the connection pool.
+
+    Records support mapping-style access, so they are returned as-is rather
+    than copied into dictionaries.
+    """
+    pool = await PostgresManager.get_pool()
+    return await pool.fetch(query, *args)
+
+async def fetch_capped(query: str, *args, max_rows: int = MAX_ROWS):
+    """
+    Executes a query through a server-side cursor, reading at most max_rows.
+
+    Returns a tuple of (records, whether the result was truncated).
     """
     pool = await PostgresManager.get_pool()
     async with pool.acquire() as conn:
-        return await conn.fetch(query, *args)
+        async with conn.transaction(readonly=True):
+            cursor = await conn.cursor(query, *args)
+            rows = await cursor.fetch(max_rows + 1)
+    return rows[:max_rows], len(rows) > max_rows
 
-async def execute_query_and_return_dict(query: str, *args):
+@alru_cache(maxsize=64, ttl=60)
+async def fetch_tables() -> List[asyncpg.Record]:
+    """
+    Returns all user tables grouped by schema, one row per schema with the
+    table names in a `tables` array. Cached briefly since the catalog rarely
+    changes.
     """
-    Executes a query and returns the result as a list of dictionaries.
+    return await execute_query("""
+        SELECT
+            schemaname,
+            array_agg(tablename::text ORDER BY tablename) AS tables
+        FROM pg_tables
+        WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
+        GROUP BY schemaname
+        ORDER BY schemaname;
+    """)
+
+@alru_cache(maxsize=64, ttl=300)
+async def fetch_schema(schema: str, table: str) -> List[asyncpg.Record]:
     """
-    rows = await execute_query(query, *args)
-    return [dict(row) for row in rows]
+    Returns the column definitions of a table, cached per (schema, table).
 
+    Reads pg_catalog directly so columns, primary key membership and foreign
+    key targets come back in a single round-trip.
+    """
+    return await execute_query("""
+        SELECT
+            a.attname AS column_name,
+            format_type(a.atttypid, a.atttypmod) AS data_type,
+            CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable,
+            pg_get_expr(d.adbin, d.adrelid) AS column_default,
+            EXISTS (
+                SELECT 1 FROM pg_index i
+                WHERE i.indrelid = a.attrelid AND i.indisprimary AND a.attnum = ANY(i.indkey)
+            ) AS primary_key,
+            (
+                SELECT fn.nspname || '.' || fc.relname || '.' || fa.attname
+                FROM pg_constraint fk
+                JOIN pg_class fc ON fc.oid = fk.confrelid
+                JOIN pg_namespace fn ON fn.oid = fc.relnamespace
+                JOIN pg_attribute fa ON fa.attrelid = fk.confrelid
+                    AND fa.attnum = fk.confkey[array_position(fk.conkey, a.attnum)]
+                WHERE fk.conrelid = a.attrelid AND fk.contype = 'f' AND a.attnum = ANY(fk.conkey)
+                LIMIT 1
+            ) AS foreign_key
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+        WHERE n.nspname = $1 AND c.relname = $2 AND a.attnum > 0 AND NOT a.attisdropped
+        ORDER BY a.attnum;
+    """, schema, table)
+
+def _url_host(url: str) -> str:
+    """
+    Returns the host, port and database of a connection URL without credentials.
+    """
+    parts = urlsplit(url)
+    return parts.netloc.rpartition('@')[2] + parts.path
 
-app = Server("postgresql-mcp")
+def _quote_ident(name: str) -> str:
+    """
+    Quotes a PostgreSQL identifier.
+    """
+    return '"' + name.replace('"', '""') + '"'
 
+async def resolve_table(table_name: str) -> Optional[str]:
+    """
+    Resolves a [schema.]table name against the catalog.
 
-@app.list_tools()
-async def handle_list_tools() -> List[Tool]:
-    """List available PostgreSQL tools"""
-    return [
-        Tool(
-            name="debug_postgres_env",
-            description="Debug PostgreSQL environment variables",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="connect_postgres",
-            description="Connect to PostgreSQL database (uses MCP_POSTGRES_URL from env)",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="list_postgres_tables",
-            description="List all tables in the connected PostgreSQL database",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="query_postgres_table",
-            description="Query data from a specific table",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table_name": {
-                        "type": "string",
-                        "description": "Name of the table (can include schema like 'public.users')"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum rows to return",
-                        "default": 100
-                    },
-                    "offset": {
-                        "type": "integer",
-                        "description": "Number of rows to skip",
-                        "default": 0
-                    }
-                },
-                "required": ["table_name"]
-            }
-        ),
-        Tool(
-            name="execute_postgres_query",
-            description="Execute a custom SELECT query",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "SQL SELECT query to execute"
-                    }
-                },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="get_postgres_schema",
-            description="Get detailed schema information for a table",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table_name": {
-                        "type": "string",
-                        "description": "Name of the table (can include schema)"
-                    }
-                },
-                "required": ["table_name"]
-            }
+    Names are matched exactly first and then case-folded, the way PostgreSQL
+    treats unquoted identifiers. Unqualified names prefer the public schema,
+    then the alphabetically first schema that has the table.
+
+    Returns the quoted "schema"."table" identifier, or None if no such table exists.
+    """
+    known = {(row['schemaname'], name) for row in await fetch_tables() for name in row['tables']}
+    schema, _, table = table_name.rpartition('.')
+    for candidate in dict.fromkeys((table, table.lower())):
+        if schema:
+            matches = sorted(
+                ((s, t) for s, t in known if t == candidate and s in (schema, schema.lower())),
+                key=lambda key: key[0] != schema,
+            )
+        else:
+            matches = sorted(
+                ((s, t) for s, t in known if t == candidate),
+                key=lambda key: (key[0] != 'public', key[0]),
+            )
+        if matches:
+            return '.'.join(map(_quote_ident, matches[0]))
+    return None
+
+def _rows_to_markdown(rows: List[asyncpg.Record], null_as: Optional[str] = None) -> str:
+    """
+    Renders query rows as a markdown table.
+
+    NULL values are shown as null_as when it is given, otherwise as str(None).
+    """
+    headers = rows[0].keys()
+    header_line = "| " + " | ".join(headers) + " |"
+    separator_line = "| " + " | ".join(["---"] * len(headers)) + " |"
+    if null_as is None:
+        body = ("| " + " | ".join(map(str, row.values())) + " |" for row in rows)
+    else:
+        body = (
+            "| " + " | ".join(null_as if v is None else str(v) for v in row.values()) + " |"
+            for row in rows
         )
-    ]
+    return "\n".join([header_line, separator_line, *body])
 
-@app.call_tool()
-async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-    """Handle PostgreSQL tool calls"""
+app = Server("postgresql-mcp")
 
-    if name == "debug_postgres_env":
-        url = os.getenv("MCP_POSTGRES_URL")
-        if url:
-            parts = url.split('@')
-            user_pass = parts[0].split('//')[1]
-            user = user_pass.split(':')[0]
-            masked_url = f"postgresql://{user}:[REDACTED]@{parts[1]}"
-            text = f"✅ `MCP_POSTGRES_URL` is set:\n`{masked_url}`"
-        else:
-            text = "❌ `MCP_POSTGRES_URL` is NOT set in the environment."
-        return [TextContent(type="text", text=text)]
+ToolResult = Union[List[TextContent], CallToolResult]
 
+_TOOLS: List[Tool] = []
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[ToolResult]]] = {}
 
-    if name == "connect_postgres":
-        try:
-            version_row = await execute_query('SELECT version()')
-            version = version_row[0]['version'] if version_row else "N/A"
+def _error(text: str) -> CallToolResult:
+    """
+    Wraps a failed tool's output text in a result flagged with isError.
+    """
+    return CallToolResult(content=[TextContent(type="text", text=text)], isError=True)
 
-            url = os.getenv("MCP_POSTGRES_URL", "")
-            masked_url = "Not set"
-            if url:
-                parts = url.split('@')
-                host_part = parts[1] if len(parts) > 1 else ""
-            else:
-                host_part = "N/A"
+def tool(definition: Tool):
+    """
+    Registers a tool handler together with the Tool definition it serves.
+    """
+    def register(handler):
+        _TOOLS.append(definition)
+        _HANDLERS[definition.name] = handler
+        return handler
+    return register
+
+@tool(Tool(
+    name="debug_postgres_env",
+    description="Debug PostgreSQL environment variables",
+    inputSchema={
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+))
+async def _h_debug_env(arguments: Dict[str, Any]) -> ToolResult:
+    url = MCP_POSTGRES_URL
+    if url:
+        parts = urlsplit(url)
+        masked_url = f"{parts.scheme}://{parts.username or ''}:[REDACTED]@{_url_host(url)}"
+        text = f"✅ `MCP_POSTGRES_URL` is set:\n`{masked_url}`"
+    else:
+        return _error("❌ `MCP_POSTGRES_URL` is NOT set in the environment.")
+    return [TextContent(type="text", text=text)]
+
+@tool(Tool(
+    name="connect_postgres",
+    description="Connect to PostgreSQL database (uses MCP_POSTGRES_URL from env)",
+    inputSchema={
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+))
+async def _h_connect(arguments: Dict[str, Any]) -> ToolResult:
+    try:
+        version_row = await execute_query('SELECT version()')
+        version = version_row[0]['version'] if version_row else "N/A"
 
+        host_part = _url_host(MCP_POSTGRES_URL) if MCP_POSTGRES_URL else "N/A"
 
-            text = f"""✅ **PostgreSQL Connection Successful!**
+        text = f"""✅ **PostgreSQL Connection Successful!**
 
 🔗 **Connected to:** `{host_part}`
 📊 **Server Version:** {version}
@@ -185,134 +279,207 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
 • Use `list_postgres_tables` to see all tables.
 • Use `query_postgres_table` to query specific tables.
 • Use `execute_postgres_query` for custom queries."""
-        except Exception as e:
-            text = f"""❌ **Connection Failed**
+    except Exception as e:
+        return _error(f"""❌ **Connection Failed**
 
 **Error:** `{e}`
 
 **Troubleshooting:**
 • Check your `MCP_POSTGRES_URL` in the `.env` file.
 • Verify your PostgreSQL server is running and accessible.
-• Confirm your credentials are correct."""
-        return [TextContent(type="text", text=text)]
-
-
-    if name == "list_postgres_tables":
-        try:
-            tables = await execute_query_and_return_dict("""
-                SELECT
-                    schemaname,
-                    tablename
-                FROM pg_tables
-                WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
-                ORDER BY schemaname, tablename;
-            """)
-
-            if not tables:
-                 return [TextContent(type="text", text="No tables found in the public schema.")]
-
-            schema_map = {}
-            for table in tables:
-                schema = table['schemaname']
-                if schema not in schema_map:
-                    schema_map[schema] = []
-                schema_map[schema].append(table['tablename'])
-
-            text = f"📋 **Found {len(tables)} tables in your database:**\n\n"
-            for schema, table_list in schema_map.items():
-                text += f"**Schema: `{schema}`**\n"
-                text += "\n".join([f"- `{table}`" for table in table_list])
-                text += "\n\n"
-
-
-        except Exception as e:
-            text = f"❌ **Failed to list tables**\n\n**Error:** {e}"
-        return [TextContent(type="text", text=text)]
-
-    if name == "query_postgres_table":
-        try:
-            table_name = arguments.get("table_name")
-            limit = arguments.get("limit", 10)
-            offset = arguments.get("offset", 0)
-
-            if not table_name or not all(c.isalnum() or c in ('.', '_') for c in table_name):
-                return [TextContent(type="text", text="Invalid table name.")]
-
-            query = f'SELECT * FROM {table_name} LIMIT $1 OFFSET $2'
-            results = await execute_query_and_return_dict(query, limit, offset)
-
-            if not results:
-                return [TextContent(type="text", text=f"No results from `{table_name}` or table is empty.")]
-
-            headers = results[0].keys()
-            header_line = "| " + " | ".join(headers) + " |"
-            separator_line = "| " + " | ".join(["---"] * len(headers)) + " |"
-            body_lines = []
-            for row in results:
-                body_lines.append("| " + " | ".join(str(v) for v in row.values()) + " |")
-
-            text = f"**Query Results for `{table_name}`:**\n\n" + "\n".join([header_line, separator_line] + body_lines)
-
-        except Exception as e:
-             text = f"❌ **Failed to query table `{table_name}`**\n\n**Error:** {e}"
-        return [TextContent(type="text", text=text)]
-
-
-    if name == "execute_postgres_query":
-        try:
-            query = arguments.get("query", "")
-            if not query.strip().upper().startswith("SELECT"):
-                return [TextContent(type="text", text="❌ **Security Error:** Only `SELECT` statements are allowed.")]
-
-            results = await execute_query_and_return_dict(query)
-            if not results:
-                return [TextContent(type="text", text="Query executed successfully, but returned no results.")]
-
-            headers = results[0].keys()
-            header_line = "| " + " | ".join(headers) + " |"
-            separator_line = "| " + " | ".join(["---"] * len(headers)) + " |"
-            body_lines = []
-            for row in results:
-                body_lines.append("| " + " | ".join(str(v) for v in row.values()) + " |")
-
-            text = f"**Custom Query Results:**\n\n" + "\n".join([header_line, separator_line] + body_lines)
-
-        except Exception as e:
-            text = f"❌ **Failed to execute query**\n\n**Error:** {e}"
-        return [TextContent(type="text", text=text)]
-
-    if name == "get_postgres_schema":
+• Confirm your credentials are correct.""")
+    return [TextContent(type="text", text=text)]
+
+@tool(Tool(
+    name="list_postgres_tables",
+    description="List all tables in the connected PostgreSQL database",
+    inputSchema={
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+))
+async def _h_list_tables(arguments: Dict[str, Any]) -> ToolResult:
+    try:
+        schemas = await fetch_tables()
+
+        if not schemas:
+             return [TextContent(type="text", text="No tables found in the public schema.")]
+
+        total = sum(len(row['tables']) for row in schemas)
+        parts = [f"📋 **Found {total} tables in your database:**\n\n"]
+        for row in schemas:
+            parts.append(f"**Schema: `{row['schemaname']}`**\n")
+            parts.extend(f"- `{table}`\n" for table in row['tables'])
+            parts.append("\n")
+        text = "".join(parts)
+
+    except Exception as e:
+        return _error(f"❌ **Failed to list tables**\n\n**Error:** {e}")
+    return [TextContent(type="text", text=text)]
+
+@tool(Tool(
+    name="query_postgres_table",
+    description="Query data from a specific table",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "table_name": {
+                "type": "string",
+                "description": "Name of the table (can include schema like 'public.users')"
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Maximum rows to return",
+                "default": 100,
+                "minimum": 1
+            },
+            "offset": {
+                "type": "integer",
+                "description": "Number of rows to skip",
+                "default": 0
+            }
+        },
+        "required": ["table_name"]
+    }
+))
+async def _h_query_table(arguments: Dict[str, Any]) -> ToolResult:
+    try:
+        table_name = arguments.get("table_name")
+        limit = arguments.get("limit", 10)
+        offset = arguments.get("offset", 0)
+
+        if not table_name or not _TABLE_RE.fullmatch(table_name):
+            return _error("Invalid table name.")
+        if not isinstance(limit, int) or limit < 1:
+            return _error("`limit` must be a positive integer.")
+
+        not_found = f"Table `{table_name}` was not found. Use `list_postgres_tables` to see available tables."
+
+        qualified_name = await resolve_table(table_name)
+        if qualified_name is None:
+            # The table may have been created since the list was cached.
+            fetch_tables.cache_clear()
+            qualified_name = await resolve_table(table_name)
+        if qualified_name is None:
+            return _error(not_found)
+
+        query = f'SELECT * FROM {qualified_name} LIMIT $1 OFFSET $2'
         try:
-            table_name = arguments.get("table_name", "")
-            schema, table = table_name.split('.') if '.' in table_name else ('public', table_name)
-
-            query = """
-            SELECT column_name, data_type, is_nullable, column_default
-            FROM information_schema.columns
-            WHERE table_schema = $1 AND table_name = $2
-            ORDER BY ordinal_position;
-            """
-            results = await execute_query_and_return_dict(query, schema, table)
-
-            if not results:
-                return [TextContent(type="text", text=f"Could not find schema for table `{table_name}`.")]
-
-
-            headers = results[0].keys()
-            header_line = "| " + " | ".join(headers) + " |"
-            separator_line = "| " + " | ".join(["---"] * len(headers)) + " |"
-            body_lines = []
-            for row in results:
-                body_lines.append("| " + " | ".join(str(v) if v is not None else "NULL" for v in row.values()) + " |")
-
-            text = f"**Schema for `{table_name}`:**\n\n" + "\n".join([header_line, separator_line] + body_lines)
+            results, truncated = await fetch_capped(query, limit, offset)
+        except asyncpg.exceptions.UndefinedTableError:
+            # The table was dropped since the list was cached.
+            fetch_tables.cache_clear()
+            return _error(not_found)
+
+        if not results:
+            return [TextContent(type="text", text=f"No results from `{table_name}` or table is empty.")]
+
+        text = f"**Query Results for `{table_name}`:**\n\n" + await asyncio.to_thread(_rows_to_markdown, results)
+        if truncated:
+            text += f"\n\n_[first {MAX_ROWS} rows]_"
+
+    except asyncpg.PostgresError as e:
+        return _error(f"❌ **Failed to query table `{table_name}`**\n\n**Error:** {type(e).__name__}: {e}")
+    except Exception as e:
+         return _error(f"❌ **Failed to query table `{table_name}`**\n\n**Error:** {e}")
+    return [TextContent(type="text", text=text)]
+
+@tool(Tool(
+    name="execute_postgres_query",
+    description="Execute a custom read-only SELECT (or WITH ... SELECT) query",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "SQL SELECT query to execute"
+            }
+        },
+        "required": ["query"]
+    }
+))
+async def _h_execute_query(arguments: Dict[str, Any]) -> ToolResult:
+    try:
+        query = arguments.get("query", "")
+        if not _SELECT_RE.match(query):
+            return _error(
+                "❌ **Security Error:** Only `SELECT` statements (including `WITH` queries) are allowed."
+            )
+
+        results, truncated = await fetch_capped(query)
+        if not results:
+            return [TextContent(type="text", text="Query executed successfully, but returned no results.")]
+
+        text = f"**Custom Query Results:**\n\n" + await asyncio.to_thread(_rows_to_markdown, results)
+        if truncated:
+            text += f"\n\n_[first {MAX_ROWS} rows]_"
+
+    except asyncpg.exceptions.UndefinedTableError as e:
+        return _error(
+            f"❌ **Failed to execute query**\n\n**Error:** {e}. Use `list_postgres_tables` to see available tables."
+        )
+    except asyncpg.PostgresError as e:
+        return _error(f"❌ **Failed to execute query**\n\n**Error:** {type(e).__name__}: {e}")
+    except Exception as e:
+        return _error(f"❌ **Failed to execute query**\n\n**Error:** {e}")
+    return [TextContent(type="text", text=text)]
+
+@tool(Tool(
+    name="get_postgres_schema",
+    description="Get detailed schema information for a table",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "table_name": {
+                "type": "string",
+                "description": "Name of the table (can include schema)"
+            }
+        },
+        "required": ["table_name"]
+    }
+))
+async def _h_get_schema(arguments: Dict[str, Any]) -> ToolResult:
+    try:
+        table_name = arguments.get("table_name", "")
+        schema, table = table_name.split('.') if '.' in table_name else ('public', table_name)
+        results = await fetch_schema(schema, table)
+
+        if not results:
+            return _error(f"Could not find schema for table `{table_name}`.")
+
+        text = f"**Schema for `{table_name}`:**\n\n" + _rows_to_markdown(results, null_as="NULL")
+
+    except Exception as e:
+        return _error(f"❌ **Failed to get schema for `{table_name}`**\n\n**Error:** {e}")
+    return [TextContent(type="text", text=text)]
+
+@tool(Tool(
+    name="refresh_schema",
+    description="Clear cached table and schema information so the next lookup reads the live catalog",
+    inputSchema={
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+))
+async def _h_refresh_schema(arguments: Dict[str, Any]) -> ToolResult:
+    fetch_tables.cache_clear()
+    fetch_schema.cache_clear()
+    return [TextContent(type="text", text="✅ Cached table and schema information cleared.")]
 
-        except Exception as e:
-            text = f"❌ **Failed to get schema for `{table_name}`**\n\n**Error:** {e}"
-        return [TextContent(type="text", text=text)]
+@app.list_tools()
+async def handle_list_tools() -> List[Tool]:
+    """List available PostgreSQL tools"""
+    return _TOOLS
 
-    else:
-        return [TextContent(type="text", text=f"❌ Unknown tool: {name}")]
+@app.call_tool()
+async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> ToolResult:
+    """Handle PostgreSQL tool calls"""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return _error(f"❌ Unknown tool: {name}")
+    return await handler(arguments)
 
 
 @app.list_resources()
@@ -330,17 +497,23 @@ async def main():
     """Main entry point for the PostgreSQL MCP server"""
     logging.basicConfig(level=logging.INFO)
 
-    await PostgresManager.get_pool()
+    try:
+        await PostgresManager.get_pool()
 
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        await PostgresManager.close()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None and sys.platform != "win32":
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\nExiting PostgreSQL MCP server.")
@@ -1,30 +1,147 @@
 import asyncio
-import sys
+import html
 import os
-import json
-import concurrent.futures
-from typing import Any, Dict, List
+import re
+import traceback
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from cachetools import TTLCache
+from dotenv import load_dotenv
+import httpx
 from mcp.server import Server
-from mcp.types import Resource, TextContent, Tool
+from mcp.types import CallToolResult, Resource, TextContent, Tool
 import mcp.server.stdio
 
-executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+from mcp_modules.openmetadata.src.config import Config
+from mcp_modules.openmetadata.src.openmetadata import AsyncOpenMetadataClient
 
-def load_and_call_openmetadata(action: str, **kwargs) -> Dict[str, Any]:
-    """Load OpenMetadata in a separate thread and make the call"""
+load_dotenv()
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Base entity fields (id, name, fullyQualifiedName, description) are always
+# returned; only the relationship fields the tools display are requested.
+TABLE_FIELDS = "columns"
+
+LIST_TABLES_PAGE_SIZE = 100
+# OpenMetadata has no multi-name table lookup, so bulk lookups fan out
+# single get_table calls, at most this many at a time.
+GET_TABLES_CONCURRENCY = 8
+
+CACHEABLE_ACTIONS = {"list_tables", "get_table"}
+result_cache = TTLCache(maxsize=512, ttl=300)
+not_found_cache = TTLCache(maxsize=512, ttl=30)
+
+# Table name -> fully qualified names, learned from list_tables and
+# successful FQN probes so repeat lookups go straight to the right FQN.
+# Names found in several databases or schemas are probed in priority order.
+_name_to_fqn: Dict[str, List[str]] = {}
+
+# Public method count reported by test_connection; fixed per client class.
+_CLIENT_PUBLIC_METHODS = sum(1 for m in dir(AsyncOpenMetadataClient) if not m.startswith('_'))
+
+@lru_cache(maxsize=1)
+def _get_client():
+    """Build the OpenMetadata config and client once and reuse them across calls"""
+    config = Config.from_env()
+    client = AsyncOpenMetadataClient(
+        host=config.OPENMETADATA_HOST,
+        api_token=config.OPENMETADATA_JWT_TOKEN,
+        username=config.OPENMETADATA_USERNAME,
+        password=config.OPENMETADATA_PASSWORD,
+    )
+    return config, client
+
+def _is_not_found(error: Exception) -> bool:
+    """Tell a definite 404 from a connection, timeout or server error"""
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 404
+
+def _consume_result(task: asyncio.Task) -> None:
+    """Mark a probe's exception as retrieved, whether or not it is awaited"""
+    if not task.cancelled():
+        task.exception()
+
+def _clean_desc(desc: Optional[str], limit: Optional[int] = 100) -> str:
+    """Strip HTML markup and entities from a description and optionally truncate it"""
+    desc = html.unescape(_HTML_TAG_RE.sub('', desc or 'No description')).strip()
+    if limit is not None and len(desc) > limit:
+        desc = desc[:limit] + "..."
+    return desc
+
+def _fqn_patterns(table_name: str) -> List[str]:
+    """FQNs to probe for a bare table name, highest priority first"""
+    return [
+        f"fivedigit.ekom24.public.{table_name}",
+        f"public.{table_name}",
+        f"ekom24.public.{table_name}"
+    ]
+
+def _fqn_rank(table_name: str, fqn: str):
+    """Sort key ordering known FQNs by probe priority, then by name"""
+    patterns = _fqn_patterns(table_name)
+    return (patterns.index(fqn) if fqn in patterns else len(patterns), fqn)
+
+async def _probe_fqns(
+    client: AsyncOpenMetadataClient, fqns: List[str], attempts: List[str], failures: Dict[str, Exception]
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Look up FQNs concurrently and return the first hit in the given order"""
+    # The lookups still in flight once a winner is found are cancelled.
+    probes = [asyncio.create_task(client.get_table_by_name(fqn, fields=TABLE_FIELDS)) for fqn in fqns]
+    # Lower-priority probes are not awaited once a winner is
+    # found; consume their errors so asyncio does not log them.
+    for probe in probes:
+        probe.add_done_callback(_consume_result)
+    try:
+        for fqn, probe in zip(fqns, probes):
+            try:
+                return fqn, await probe
+            except Exception as e:
+                attempts.append(f"FQN {fqn} - failed")
+                failures[fqn] = e
+    finally:
+        for probe in probes:
+            probe.cancel()
+    return None, None
+
+async def _iter_table_pages(client: AsyncOpenMetadataClient, limit: int):
+    """Yield list_tables pages until limit tables are fetched, following the paging cursor"""
+    after = None
+    remaining = limit
+    while remaining > 0:
+        page = await client.list_tables(limit=min(LIST_TABLES_PAGE_SIZE, remaining), after=after)
+        yield page
+        if not isinstance(page, dict) or not page.get('data'):
+            return
+        remaining -= len(page['data'])
+        after = (page.get('paging') or {}).get('after')
+        if not after:
+            return
+
+async def openmetadata_call(action: str, **kwargs) -> Dict[str, Any]:
+    """Make an OpenMetadata call, serving repeated metadata lookups from cache"""
+    if action not in CACHEABLE_ACTIONS:
+        return await _openmetadata_call(action, **kwargs)
+
+    key = (action, kwargs.get("table_name"), kwargs.get("limit"))
+    cached = result_cache.get(key) or not_found_cache.get(key)
+    if cached is not None:
+        return {**cached, 'cached': True}
+
+    result = await _openmetadata_call(action, **kwargs)
+    if result['success']:
+        result_cache[key] = result
+    elif result.get('not_found'):
+        # Every lookup for this name got a 404; remember briefly so repeated
+        # questions about a missing table do not re-probe all FQN patterns.
+        # Transport and server errors are not cached.
+        not_found_cache[key] = result
+    return result
+
+async def _openmetadata_call(action: str, **kwargs) -> Dict[str, Any]:
+    """Make an OpenMetadata call on the shared async client"""
     try:
-        import os
-        from dotenv import load_dotenv
-        
-        load_dotenv()
-        
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        sys.path.insert(0, current_dir)
-        
-        from mcp_modules.openmetadata.src.config import Config
-        from mcp_modules.openmetadata.src.openmetadata import OpenMetadataClient
-        
         if action == "debug_env":
             return {
                 'success': True,
@@ -39,29 +156,26 @@ def load_and_call_openmetadata(action: str, **kwargs) -> Dict[str, Any]:
                 'env_file_exists': os.path.exists('.env')
             }
         
-        config = Config.from_env()
-        client = OpenMetadataClient(
-            host=config.OPENMETADATA_HOST,
-            api_token=config.OPENMETADATA_JWT_TOKEN,
-            username=config.OPENMETADATA_USERNAME,
-            password=config.OPENMETADATA_PASSWORD,
-        )
+        config, client = _get_client()
         
         if action == "list_tables":
             limit = kwargs.get("limit", 10)
-            result = client.list_tables(limit=limit)
+            formatted_tables = []
             
-            if isinstance(result, dict) and 'data' in result:
-                tables = result['data']
-                formatted_tables = []
+            async for result in _iter_table_pages(client, limit):
+                if not (isinstance(result, dict) and 'data' in result):
+                    return {
+                        'success': False,
+                        'error': f'Unexpected response format: {type(result)}',
+                        'raw_data': str(result)[:200]
+                    }
                 
-                for table in tables:
-                    desc = table.get('description', 'No description')
-                    if desc.startswith('<p>'):
-                        import re
-                        desc = re.sub(r'<[^>]+>', '', desc).strip()
-                    if len(desc) > 100:
-                        desc = desc[:100] + "..."
+                for table in result['data']:
+                    desc = _clean_desc(table.get('description', 'No description'))
+                    if table.get('name') and table.get('fullyQualifiedName'):
+                        fqns = _name_to_fqn.setdefault(table['name'], [])
+                        if table['fullyQualifiedName'] not in fqns:
+                            fqns.append(table['fullyQualifiedName'])
                     
                     formatted_tables.append({
                         'name': table.get('name', 'Unknown'),
@@ -69,19 +183,13 @@ def load_and_call_openmetadata(action: str, **kwargs) -> Dict[str, Any]:
                         'description': desc,
                         'id': table.get('id', 'Unknown')
                     })
-                
-                return {
-                    'success': True,
-                    'action': action,
-                    'count': len(formatted_tables),
-                    'tables': formatted_tables
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': f'Unexpected response format: {type(result)}',
-                    'raw_data': str(result)[:200]
-                }
+            
+            return {
+                'success': True,
+                'action': action,
+                'count': len(formatted_tables),
+                'tables': formatted_tables
+            }
         
         elif action == "get_table":
             table_name = kwargs.get("table_name")
@@ -89,60 +197,77 @@ def load_and_call_openmetadata(action: str, **kwargs) -> Dict[str, Any]:
             table_data = None
             method_used = None
             attempts = []
+            # Lookup target -> error, for every lookup that failed.
+            failures: Dict[str, Exception] = {}
             
-            try:
-                table_data = client.get_table_by_name(table_name)
-                method_used = "get_table_by_name (exact)"
-                attempts.append("get_table_by_name - success")
-            except Exception as e1:
-                attempts.append(f"get_table_by_name - failed: {str(e1)[:50]}")
-                
+            known_fqns = sorted(_name_to_fqn.get(table_name, ()), key=lambda fqn: _fqn_rank(table_name, fqn))
+            if known_fqns:
+                fqn, table_data = await _probe_fqns(client, known_fqns, attempts, failures)
+                if table_data:
+                    method_used = f"get_table_by_name (known FQN: {fqn})"
+                # Forget only the FQNs that are gone, not those that failed
+                # for a transient reason.
+                remaining = [fqn for fqn in known_fqns if not _is_not_found(failures.get(fqn))]
+                if remaining:
+                    _name_to_fqn[table_name] = remaining
+                else:
+                    _name_to_fqn.pop(table_name, None)
+            else:
                 try:
-                    if '.' not in table_name:
-                        fqn_attempts = [
-                            f"fivedigit.ekom24.public.{table_name}",
-                            f"public.{table_name}",
-                            f"ekom24.public.{table_name}"
-                        ]
-                        
-                        for fqn in fqn_attempts:
-                            try:
-                                table_data = client.get_table_by_name(fqn)
-                                method_used = f"get_table_by_name (FQN: {fqn})"
-                                attempts.append(f"FQN {fqn} - success")
-                                break
-                            except Exception as e2:
-                                attempts.append(f"FQN {fqn} - failed")
-                                continue
-                    
-                    if not table_data:
-                        table_data = client.get_table(table_name)
-                        method_used = "get_table (ID)"
-                        attempts.append("get_table by ID - success")
-                        
+                    table_data = await client.get_table_by_name(table_name, fields=TABLE_FIELDS)
+                    method_used = "get_table_by_name (exact)"
+                except Exception as e1:
+                    attempts.append(f"get_table_by_name - failed: {str(e1)[:50]}")
+                    failures[table_name] = e1
+            
+            if not table_data and '.' in table_name:
+                # Already a fully qualified name; the FQN patterns and
+                # the ID lookup cannot match it either.
+                return {
+                    'success': False,
+                    'error': f'Could not find table with any method. Last error: {[*failures.values()][-1]}',
+                    'table_name': table_name,
+                    'attempts': attempts,
+                    'not_found': all(map(_is_not_found, failures.values()))
+                }
+            
+            if not table_data:
+                patterns = [fqn for fqn in _fqn_patterns(table_name) if fqn not in failures]
+                fqn, table_data = await _probe_fqns(client, patterns, attempts, failures)
+                if table_data:
+                    known = _name_to_fqn.setdefault(table_name, [])
+                    if fqn not in known:
+                        known.append(fqn)
+                    method_used = f"get_table_by_name (FQN: {fqn})"
+                    attempts.append(f"FQN {fqn} - success")
+            
+            if not table_data:
+                try:
+                    table_data = await client.get_table(table_name, fields=TABLE_FIELDS)
+                    method_used = "get_table (ID)"
+                    attempts.append("get_table by ID - success")
                 except Exception as e3:
                     attempts.append(f"get_table by ID - failed: {str(e3)[:50]}")
+                    failures[f"id:{table_name}"] = e3
                     return {
                         'success': False,
                         'error': f'Could not find table with any method. Last error: {e3}',
                         'table_name': table_name,
-                        'attempts': attempts
+                        'attempts': attempts,
+                        'not_found': all(map(_is_not_found, failures.values()))
                     }
             
             if table_data:
-                desc = table_data.get('description', 'No description')
-                if desc.startswith('<p>'):
-                    import re
-                    desc = re.sub(r'<[^>]+>', '', desc).strip()
+                desc = _clean_desc(table_data.get('description', 'No description'), limit=None)
                 
-                columns = []
-                if 'columns' in table_data:
-                    for col in table_data['columns'][:10]: 
-                        columns.append({
-                            'name': col.get('name', 'Unknown'),
-                            'type': col.get('dataType', 'Unknown'),
-                            'description': col.get('description', '')
-                        })
+                columns = [
+                    {
+                        'name': col.get('name', 'Unknown'),
+                        'type': col.get('dataType', 'Unknown'),
+                        'description': col.get('description', '')
+                    }
+                    for col in islice(table_data.get('columns') or (), 10)
+                ]
                 
                 return {
                     'success': True,
@@ -155,7 +280,7 @@ def load_and_call_openmetadata(action: str, **kwargs) -> Dict[str, Any]:
                         'description': desc,
                         'id': table_data.get('id', 'Unknown'),
                         'columns': columns,
-                        'column_count': len(table_data.get('columns', []))
+                        'column_count': len(table_data.get('columns') or ())
                     }
                 }
             else:
@@ -167,12 +292,31 @@ def load_and_call_openmetadata(action: str, **kwargs) -> Dict[str, Any]:
                     'attempts': attempts
                 }
         
+        elif action == "get_tables":
+            semaphore = asyncio.Semaphore(GET_TABLES_CONCURRENCY)
+            
+            async def lookup(name: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await openmetadata_call("get_table", table_name=name)
+            
+            names = list(dict.fromkeys(kwargs.get("table_names") or []))
+            results = await asyncio.gather(*(lookup(name) for name in names))
+            return {
+                'success': True,
+                'action': action,
+                'tables': [r['table'] for r in results if r['success']],
+                'failed': [
+                    {'table_name': name, 'error': r['error']}
+                    for name, r in zip(names, results) if not r['success']
+                ]
+            }
+        
         elif action == "test_connection":
             return {
                 'success': True,
                 'action': action,
                 'host': config.OPENMETADATA_HOST,
-                'client_methods': len([m for m in dir(client) if not m.startswith('_')])
+                'client_methods': _CLIENT_PUBLIC_METHODS
             }
         
         else:
@@ -182,91 +326,118 @@ def load_and_call_openmetadata(action: str, **kwargs) -> Dict[str, Any]:
             }
     
     except Exception as e:
-        import traceback
-        return {
+        result = {
             'success': False,
             'error': str(e),
-            'traceback': traceback.format_exc(),
             'action': action
         }
-
-async def async_openmetadata_call(action: str, **kwargs) -> Dict[str, Any]:
-    """Make OpenMetadata call asynchronously"""
-    loop = asyncio.get_event_loop()
-    try:
-        result = await loop.run_in_executor(
-            executor, 
-            lambda: load_and_call_openmetadata(action, **kwargs)
-        )
+        if os.getenv('MCP_DEBUG'):
+            result['traceback'] = traceback.format_exc()
         return result
-    except Exception as e:
-        return {
-            'success': False,
-            'error': f'Async call failed: {e}',
-            'action': action
-        }
 
 app = Server("fixed-hybrid-openmetadata")
 
+_CONNECTION_OK_TEMPLATE = """ **OpenMetadata Connection Test Successful!**
+
+ **Host:** {host}
+ **Client Methods:** {client_methods}
+ **Status:** Ready to use
+
+ **Next Steps:** Try 'list_om_tables' to see your catalog!"""
+
+_CONNECTION_FAILED_TEMPLATE = """ **Connection Test Failed**
+
+**Error:** {error}
+
+**Troubleshooting:**
+• Check your .env file configuration
+• Verify OpenMetadata server is accessible
+• Confirm JWT token is valid"""
+
+def _text(text: str) -> List[TextContent]:
+    """Wrap a tool's output text in a single TextContent"""
+    return [TextContent(type="text", text=text)]
+
+def _error(text: str) -> CallToolResult:
+    """Wrap a failed tool's output text in a result flagged with isError"""
+    return CallToolResult(content=_text(text), isError=True)
+
+_TOOLS: List[Tool] = [
+    Tool(
+        name="debug_env",
+        description="Debug environment variables for OpenMetadata",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="test_om_connection",
+        description="Test OpenMetadata connection (fast)",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="list_om_tables",
+        description="List tables from OpenMetadata catalog",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of tables to return",
+                    "default": 10
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="get_om_table",
+        description="Get detailed information about a specific table",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Name of the table (e.g., 'ekomdata')"
+                }
+            },
+            "required": ["table_name"]
+        }
+    ),
+    Tool(
+        name="list_om_tables_by_names",
+        description="Get information about several tables at once",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Names of the tables (e.g., ['ekomdata', 'customers'])"
+                }
+            },
+            "required": ["table_names"]
+        }
+    )
+]
+
 @app.list_tools()
 async def handle_list_tools() -> List[Tool]:
     """List available tools - exact same as working server"""
-    return [
-        Tool(
-            name="debug_env",
-            description="Debug environment variables for OpenMetadata",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="test_om_connection",
-            description="Test OpenMetadata connection (fast)",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="list_om_tables",
-            description="List tables from OpenMetadata catalog",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of tables to return",
-                        "default": 10
-                    }
-                },
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_om_table",
-            description="Get detailed information about a specific table",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table_name": {
-                        "type": "string",
-                        "description": "Name of the table (e.g., 'ekomdata')"
-                    }
-                },
-                "required": ["table_name"]
-            }
-        )
-    ]
+    return _TOOLS
 
 @app.call_tool()
-async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Union[List[TextContent], CallToolResult]:
     """Handle tool calls - exact same pattern as working server"""
     
     if name == "debug_env":
-        result = await async_openmetadata_call("debug_env")
+        result = await openmetadata_call("debug_env")
         
         if result['success']:
             env_vars = result['env_vars']
@@ -285,44 +456,33 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
         else:
             text = f" **Debug failed:** {result['error']}"
         
-        return [TextContent(type="text", text=text)]
+        return _text(text) if result['success'] else _error(text)
     
     elif name == "test_om_connection":
-        result = await async_openmetadata_call("test_connection")
+        result = await openmetadata_call("test_connection")
         
         if result['success']:
-            text = f""" **OpenMetadata Connection Test Successful!**
-
- **Host:** {result['host']}
- **Client Methods:** {result['client_methods']}
- **Status:** Ready to use
-
- **Next Steps:** Try 'list_om_tables' to see your catalog!"""
+            text = _CONNECTION_OK_TEMPLATE.format(host=result['host'], client_methods=result['client_methods'])
         else:
-            text = f""" **Connection Test Failed**
-
-**Error:** {result['error']}
-
-**Troubleshooting:**
-• Check your .env file configuration
-• Verify OpenMetadata server is accessible
-• Confirm JWT token is valid"""
+            text = _CONNECTION_FAILED_TEMPLATE.format(error=result['error'])
         
-        return [TextContent(type="text", text=text)]
+        return _text(text) if result['success'] else _error(text)
     
     elif name == "list_om_tables":
         limit = arguments.get("limit", 10)
-        result = await async_openmetadata_call("list_tables", limit=limit)
+        result = await openmetadata_call("list_tables", limit=limit)
         
         if result['success']:
             tables = result['tables']
-            text = f"📋 **Found {result['count']} tables in your OpenMetadata catalog:**\n\n"
-            
-            for table in tables:
-                text += f" **{table['name']}**\n"
-                text += f"    Full path: `{table['fqn']}`\n"
-                text += f"    Description: {table['description']}\n"
-                text += f"    ID: `{table['id'][:8]}...`\n\n"
+            parts = [f"📋 **Found {result['count']} tables in your OpenMetadata catalog:**\n\n"]
+            parts.extend(
+                f" **{table['name']}**\n"
+                f"    Full path: `{table['fqn']}`\n"
+                f"    Description: {table['description']}\n"
+                f"    ID: `{table['id'][:8]}...`\n\n"
+                for table in tables
+            )
+            text = "".join(parts)
             
             if result['count'] == 0:
                 text = "📋 No tables found in your OpenMetadata catalog."
@@ -331,63 +491,99 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
             if 'raw_data' in result:
                 text += f"\n\n**Raw Response:** {result['raw_data']}"
         
-        return [TextContent(type="text", text=text)]
+        return _text(text) if result['success'] else _error(text)
     
     elif name == "get_om_table":
         table_name = arguments.get("table_name")
-        result = await async_openmetadata_call("get_table", table_name=table_name)
+        result = await openmetadata_call("get_table", table_name=table_name)
         
         if result['success']:
             table = result['table']
-            text = f" **Table Details: {table['name']}**\n\n"
-            text += f" **Full Name:** `{table['fqn']}`\n"
-            text += f" **ID:** `{table['id'][:8]}...`\n"
-            text += f" **Description:** {table['description']}\n"
-            text += f" **Retrieved via:** {result['method_used']}\n\n"
+            parts = [
+                f" **Table Details: {table['name']}**\n\n"
+                f" **Full Name:** `{table['fqn']}`\n"
+                f" **ID:** `{table['id'][:8]}...`\n"
+                f" **Description:** {table['description']}\n"
+                f" **Retrieved via:** {result['method_used']}\n\n"
+            ]
             
             if table['columns']:
-                text += f" **Columns ({table['column_count']} total, showing first {len(table['columns'])}):**\n"
-                for col in table['columns']:
-                    text += f"   • **{col['name']}** ({col['type']})"
-                    if col['description']:
-                        text += f" - {col['description']}"
-                    text += "\n"
+                parts.append(f" **Columns ({table['column_count']} total, showing first {len(table['columns'])}):**\n")
+                parts.extend(
+                    f"   • **{col['name']}** ({col['type']})"
+                    + (f" - {col['description']}" if col['description'] else "")
+                    + "\n"
+                    for col in table['columns']
+                )
                 
                 if table['column_count'] > len(table['columns']):
-                    text += f"   ... and {table['column_count'] - len(table['columns'])} more columns\n"
+                    parts.append(f"   ... and {table['column_count'] - len(table['columns'])} more columns\n")
             else:
-                text += " **No column information available**\n"
+                parts.append(" **No column information available**\n")
                 
-            text += f"\n **Debug - Attempts made:** {', '.join(result.get('attempts', []))}"
+            if result.get('attempts'):
+                parts.append(f"\n **Debug - Attempts made:** {', '.join(result['attempts'])}")
+            text = "".join(parts)
         else:
             text = f" **Failed to get table '{table_name}'**\n\n**Error:** {result['error']}"
             if 'attempts' in result:
                 text += f"\n\n **Attempts made:** {', '.join(result['attempts'])}"
         
-        return [TextContent(type="text", text=text)]
+        return _text(text) if result['success'] else _error(text)
+    
+    elif name == "list_om_tables_by_names":
+        table_names = arguments.get("table_names") or []
+        result = await openmetadata_call("get_tables", table_names=table_names)
+        
+        if result['success']:
+            requested = len(result['tables']) + len(result['failed'])
+            parts = [f"📋 **Found {len(result['tables'])} of {requested} requested tables:**\n\n"]
+            parts.extend(
+                f" **{table['name']}**\n"
+                f"    Full path: `{table['fqn']}`\n"
+                f"    Description: {table['description']}\n"
+                f"    Columns: {table['column_count']}\n\n"
+                for table in result['tables']
+            )
+            if result['failed']:
+                parts.append(" **Not found:**\n")
+                parts.extend(f"   • {f['table_name']}: {f['error']}\n" for f in result['failed'])
+            text = "".join(parts)
+        else:
+            text = f" **Failed to get tables**\n\n**Error:** {result['error']}"
+        
+        # Missing tables make the answer incomplete, so report it as an error.
+        return _text(text) if result['success'] and not result['failed'] else _error(text)
     
     else:
-        return [TextContent(type="text", text=f"❌ Unknown tool: {name}")]
+        return _error(f"❌ Unknown tool: {name}")
+
+_RESOURCES: List[Resource] = [
+    Resource(
+        uri="openmetadata://fixed-hybrid",
+        name="Fixed Hybrid OpenMetadata",
+        description="OpenMetadata data with lazy loading (fixed version)"
+    )
+]
 
 @app.list_resources()
 async def handle_list_resources() -> List[Resource]:
     """List available resources - exact same as working server"""
-    return [
-        Resource(
-            uri="openmetadata://fixed-hybrid",
-            name="Fixed Hybrid OpenMetadata",
-            description="OpenMetadata data with lazy loading (fixed version)"
-        )
-    ]
+    return _RESOURCES
 
 async def main():
     """Main function - EXACT same as working server"""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream, 
-            write_stream,
-            app.create_initialization_options()
-        )
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream, 
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        if _get_client.cache_info().currsize:
+            _, client = _get_client()
+            await client.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Chainlit writes its config, translations and upload directory under the app
+# root on import; keep that out of the working tree.
+os.environ.setdefault("CHAINLIT_APP_ROOT", tempfile.mkdtemp(prefix="chainlit-tests-"))
+os.environ.setdefault("OPENMETADATA_HOST", "http://openmetadata.test")
+os.environ.setdefault("OPENMETADATA_JWT_TOKEN", "test-token")
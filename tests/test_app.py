@@ -0,0 +1,142 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import app
+
+
+class UserSession:
+    """Stand-in for cl.user_session that can switch between users."""
+
+    def __init__(self):
+        self.stores = {}
+        self.current = None
+
+    def get(self, key, default=None):
+        return self.stores[self.current].get(key, default)
+
+    def set(self, key, value):
+        self.stores[self.current][key] = value
+
+    def use(self, user):
+        self.stores.setdefault(user, {})
+        self.current = user
+
+
+class Message:
+    def __init__(self, content=""):
+        self.content = content
+
+    async def send(self):
+        return self
+
+
+class Session:
+    def __init__(self, *tool_names, schema=None):
+        self.tools = [
+            SimpleNamespace(
+                name=name,
+                description=f"{name} tool",
+                inputSchema=schema or {"type": "object", "properties": {}},
+            )
+            for name in tool_names
+        ]
+
+    async def list_tools(self):
+        return SimpleNamespace(tools=self.tools)
+
+
+def connection(name, *args):
+    return SimpleNamespace(name=name, url=None, command="python", args=list(args))
+
+
+@pytest.fixture
+def users(monkeypatch):
+    session = UserSession()
+    monkeypatch.setattr(app.cl, "user_session", session)
+    monkeypatch.setattr(app.cl, "Message", Message)
+    for registry in (app.mcp_tools, app.mcp_openai_tools, app.mcp_tool_index, app.mcp_validators, app.mcp_pool):
+        registry.clear()
+    yield session
+    for registry in (app.mcp_tools, app.mcp_openai_tools, app.mcp_tool_index, app.mcp_validators, app.mcp_pool):
+        registry.clear()
+
+
+def tool_names(user_session):
+    keys = user_session.get("mcp_pool_keys", {}).values()
+    return sorted(tool["function"]["name"] for tool in app.collect_openai_tools(keys))
+
+
+def test_same_name_different_targets_do_not_clobber(users):
+    target_a = connection("db", "server_a.py")
+    target_b = connection("db", "server_b.py")
+    session_a = Session("get_a", schema={"type": "object", "required": ["x"]})
+    session_b = Session("get_b")
+
+    async def scenario():
+        users.use("alice")
+        await app.on_mcp_connect(target_a, session_a)
+        users.use("bob")
+        await app.on_mcp_connect(target_b, session_b)
+
+        users.use("alice")
+        assert tool_names(users) == ["get_a"]
+        assert app.find_mcp_for_tool("get_a", users.get("mcp_pool_keys")) == "db"
+        assert app.find_mcp_for_tool("get_b", users.get("mcp_pool_keys")) is None
+        assert app.mcp_validators[app.mcp_pool_key(target_a), "get_a"] is not None
+
+        users.use("bob")
+        assert tool_names(users) == ["get_b"]
+        await app.on_mcp_disconnect("db", session_b)
+
+        users.use("alice")
+        assert tool_names(users) == ["get_a"]
+        assert app.find_mcp_for_tool("get_a", users.get("mcp_pool_keys")) == "db"
+
+        await app.on_mcp_disconnect("db", session_a)
+        assert not (app.mcp_tools or app.mcp_openai_tools or app.mcp_tool_index or app.mcp_validators)
+        assert app.mcp_pool == {}
+
+    asyncio.run(scenario())
+
+
+def test_shared_target_is_pooled_until_last_user_leaves(users):
+    target = connection("om", "mcp_server.py")
+    first, second = Session("get_om_table"), Session("get_om_table")
+
+    async def scenario():
+        users.use("alice")
+        await app.on_mcp_connect(target, first)
+        users.use("bob")
+        await app.on_mcp_connect(target, second)
+        assert app.mcp_pool[app.mcp_pool_key(target)]["refs"] == 2
+
+        await app.on_mcp_disconnect("om", second)
+        users.use("alice")
+        assert tool_names(users) == ["get_om_table"]
+
+        await app.on_mcp_disconnect("om", first)
+        assert app.mcp_pool == {} and app.mcp_tool_index == {}
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_releases_the_replaced_session_once(users):
+    target = connection("om", "mcp_server.py")
+    old, new = Session("get_om_table"), Session("get_om_table")
+
+    async def scenario():
+        users.use("alice")
+        await app.on_mcp_connect(target, old)
+        await app.on_mcp_connect(target, new)
+        await app.on_mcp_disconnect("om", old)
+
+        assert users.get("mcp_sessions")["om"] is new
+        assert tool_names(users) == ["get_om_table"]
+        assert app.mcp_pool[app.mcp_pool_key(target)]["refs"] == 1
+
+        await app.on_mcp_disconnect("om", new)
+        assert users.get("mcp_sessions") == {} and app.mcp_pool == {}
+
+    asyncio.run(scenario())
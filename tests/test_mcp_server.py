@@ -0,0 +1,80 @@
+import asyncio
+import gc
+
+import httpx
+import pytest
+
+import mcp_server
+
+PRIORITY_FQN = "fivedigit.ekom24.public.ekomdata"
+
+
+@pytest.fixture
+def openmetadata(monkeypatch):
+    """Route the shared OpenMetadata client through an httpx mock transport."""
+    routes = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        name = request.url.path.rsplit("/", 1)[-1]
+        delay, status, body = routes.get(name, (0, 404, {"message": "not found"}))
+        await asyncio.sleep(delay)
+        return httpx.Response(status, json=body)
+
+    _, client = mcp_server._get_client()
+    monkeypatch.setattr(
+        client, "session", httpx.AsyncClient(transport=httpx.MockTransport(handler), headers=client.session.headers)
+    )
+    for cache in (mcp_server.result_cache, mcp_server.not_found_cache, mcp_server._name_to_fqn):
+        cache.clear()
+    yield routes
+    for cache in (mcp_server.result_cache, mcp_server.not_found_cache, mcp_server._name_to_fqn):
+        cache.clear()
+
+
+def table(fqn):
+    return {"id": "0123456789", "name": fqn.rsplit(".", 1)[-1], "fullyQualifiedName": fqn, "columns": []}
+
+
+def test_failed_probes_leave_no_unretrieved_exceptions(openmetadata):
+    # The priority pattern answers last, so the other probes have already
+    # failed with 404 by the time the winner returns.
+    openmetadata[PRIORITY_FQN] = (0.05, 200, table(PRIORITY_FQN))
+    errors = []
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        result = await mcp_server._openmetadata_call("get_table", table_name="ekomdata")
+        await asyncio.sleep(0.1)
+        gc.collect()
+        return result
+
+    result = asyncio.run(scenario())
+    assert result["success"]
+    assert result["table"]["fqn"] == PRIORITY_FQN
+    assert errors == []
+
+
+def test_ambiguous_name_uses_known_fqns_in_priority_order(openmetadata):
+    for fqn in ("other.sales.public.ekomdata", PRIORITY_FQN):
+        openmetadata[fqn] = (0, 200, table(fqn))
+    mcp_server._name_to_fqn["ekomdata"] = ["other.sales.public.ekomdata", PRIORITY_FQN]
+
+    result = asyncio.run(mcp_server._openmetadata_call("get_table", table_name="ekomdata"))
+
+    assert result["success"]
+    assert result["table"]["fqn"] == PRIORITY_FQN
+    assert result["method_used"] == f"get_table_by_name (known FQN: {PRIORITY_FQN})"
+
+
+def test_only_known_fqns_that_404_are_forgotten(openmetadata):
+    listed = "other.sales.public.ekomdata"
+    openmetadata[listed] = (0, 200, table(listed))
+    openmetadata["stale.db.public.ekomdata"] = (0, 503, {"message": "unavailable"})
+    mcp_server._name_to_fqn["ekomdata"] = ["gone.db.public.ekomdata", "stale.db.public.ekomdata", listed]
+
+    result = asyncio.run(mcp_server.openmetadata_call("get_table", table_name="ekomdata"))
+
+    assert result["success"]
+    assert result["table"]["fqn"] == listed
+    assert mcp_server._name_to_fqn["ekomdata"] == ["other.sales.public.ekomdata", "stale.db.public.ekomdata"]
+    assert not mcp_server.not_found_cache